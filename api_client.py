@@ -1,47 +1,170 @@
 # api_client.py
+import json
+import os
+import random
 import time
+import types
 import pyotp
+import numpy as np
 import pandas as pd
 import requests
 import logging
+
+try:
+    import orjson
+except ImportError:
+    orjson = None # Optional; stdlib json is used when unavailable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from SmartApi import SmartConnect
 from SmartApi.smartExceptions import SmartAPIException, DataException # Import DataException
 
 from config import (
-    APIKEY, CLIENTID, PASSWORD, LOGINTOKEN,
-    MAX_RETRIES, RETRY_DELAY, TIME_INTERVAL
+    APIKEY, CLIENTID, PASSWORD, LOGINTOKEN, REQUIRED_CREDENTIALS,
+    TIME_INTERVAL,
+    RETRY_CONFIG, RetryConfig,
+    MAX_CONCURRENT_REQUESTS, REQUEST_DELAY, MAX_REQUESTS_PER_SECOND,
+    SESSION_CACHE_PATH, SESSION_TTL_HOURS,
+    CB_FAILURE_THRESHOLD, CB_OPEN_SECONDS
 )
+from rate_limiter import AdaptiveTokenBucket, CircuitBreaker
+import candle_cache
 
 logger = logging.getLogger(__name__)
 
+# Rate-limit responses back off more aggressively than ordinary transient
+# failures, since hammering a throttled endpoint only extends the throttle.
+RATE_LIMIT_BACKOFF_MULTIPLIER = 4
+
+# Sanity cap on any server-provided Retry-After hint, in seconds.
+RETRY_AFTER_MAX_SECONDS = 60.0
+
+# Angel One timestamps are always 'YYYY-MM-DDTHH:MM:SS+05:30'. Parsing with a
+# fixed format takes pandas' C fast path instead of per-row format inference.
+API_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+IST_TZ = "Asia/Kolkata"
+
+
+def _fmt_ist(d: datetime) -> str:
+    """
+    Formats a naive datetime as 'YYYY-MM-DD HH:MM' for the candle API.
+
+    Equivalent to strftime('%Y-%m-%d %H:%M') but via direct attribute access,
+    skipping the locale-aware format-string walker — trivial per call, but
+    get_candle_data runs for every chunk of every token.
+    """
+    return f"{d.year:04d}-{d.month:02d}-{d.day:02d} {d.hour:02d}:{d.minute:02d}"
+
+
+def _install_fast_json_decoder():
+    """
+    Routes the SmartApi SDK's JSON decoding through orjson when available.
+
+    Candle responses are large numeric arrays, exactly where orjson's decoder
+    is 2-5x faster than stdlib json. The SDK resolves 'json.loads' through its
+    own module namespace, so rebinding that one attribute to a shim swaps the
+    decoder without touching the process-wide json module. orjson's
+    JSONDecodeError subclasses json.JSONDecodeError, so the SDK's error
+    handling (including rate-limit detection on decode failure) is unaffected.
+    Encoding stays on stdlib json: orjson.dumps returns bytes and supports
+    fewer keyword arguments, so it is not a drop-in replacement there.
+    """
+    if orjson is None:
+        return
+    try:
+        from SmartApi import smartConnect as sdk_module
+    except ImportError:
+        logger.debug("SmartApi.smartConnect module not importable; skipping orjson decoder install.")
+        return
+    if getattr(sdk_module, 'json', None) is not json:
+        # The SDK doesn't use the stdlib module directly (or was already patched).
+        return
+    sdk_module.json = types.SimpleNamespace(
+        loads=orjson.loads,
+        load=json.load,
+        dumps=json.dumps,
+        dump=json.dump,
+        JSONDecodeError=json.JSONDecodeError,
+    )
+    logger.debug("Installed orjson as the SmartApi SDK's JSON decoder.")
+
+
+_install_fast_json_decoder()
+
+# Shared across all tokens and worker threads so the aggregate request rate
+# adapts to Angel One's actual capacity. Seeded from REQUEST_DELAY so startup
+# behaviour matches the old fixed-delay spacing, and capped at the documented
+# per-second limit so additive increase never probes past the published quota.
+_RATE_BUCKET = AdaptiveTokenBucket(
+    rate=(1.0 / REQUEST_DELAY) if REQUEST_DELAY > 0 else 4.0,
+    max_rate=MAX_REQUESTS_PER_SECOND,
+)
+
+# Shared across all tokens: a sustained rate-limit storm trips the breaker and
+# short-circuits further calls instead of burning MAX_RETRIES per token.
+_CIRCUIT_BREAKER = CircuitBreaker(CB_FAILURE_THRESHOLD, CB_OPEN_SECONDS)
+
 class SmartApiClient:
     """
     Handles authentication and API calls to Angel One SmartApi.
     Assumes API times are implicitly IST and returns naive datetimes.
     """
-    def __init__(self):
+    # urllib3 pool size for the SDK's session. Sized above MAX_CONCURRENT_REQUESTS
+    # so worker threads never queue on a pooled connection.
+    POOL_SIZE = 16
+
+    def __init__(self, retry_cfg: RetryConfig = RETRY_CONFIG):
         self.smartApi = None
         self.client_id = CLIENTID
         self.interval = TIME_INTERVAL
+        # Attribute reads inside the retry loop are cheaper than module-global
+        # lookups, and the frozen dataclass keeps the settings coherent.
+        self._retry = retry_cfg
         self._authenticate()
+        self._configure_connection_pool()
+
+    def _configure_connection_pool(self):
+        """
+        Mounts a larger urllib3 connection pool on the SDK's requests session.
+
+        Keeping TLS connections alive and pooled means the retry loop and the
+        concurrent fetch workers reuse warm connections instead of paying a
+        TCP+TLS handshake per request. The SDK's session attribute name has
+        varied across versions, so this probes defensively and is a no-op if
+        no requests.Session is exposed.
+        """
+        session = None
+        for attr in ('reqsession', 'requests_session', 'session'):
+            candidate = getattr(self.smartApi, attr, None)
+            if isinstance(candidate, requests.Session):
+                session = candidate
+                break
+        if session is None:
+            logger.debug("SmartApi SDK does not expose a requests.Session; skipping connection-pool tuning.")
+            return
+
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.POOL_SIZE, pool_maxsize=self.POOL_SIZE
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        logger.debug(f"Mounted pooled HTTPAdapter (size {self.POOL_SIZE}) on the SmartApi session.")
 
     def _authenticate(self):
         """Authenticates with the SmartApi."""
         logger.info("Attempting SmartApi authentication...")
-        # Check for configured credentials before proceeding
-        if APIKEY is None or 'YOUR_APIKEY_PLACEHOLDER' in str(APIKEY):
-             logger.critical("API Key is not configured. Set the APIKEY environment variable.")
-             raise ValueError("API Key not configured.")
-        if CLIENTID is None or 'YOUR_CLIENTID_PLACEHOLDER' in str(CLIENTID):
-             logger.critical("Client ID is not configured. Set the CLIENTID environment variable.")
-             raise ValueError("Client ID not configured.")
-        if PASSWORD is None or 'YOUR_PIN_PLACEHOLDER' in str(PASSWORD):
-             logger.critical("Password/PIN is not configured. Set the PASSWORD environment variable.")
-             raise ValueError("Password/PIN not configured.")
-        if LOGINTOKEN is None or 'YOUR_TOTP_LOGINTOKEN_PLACEHOLDER' in str(LOGINTOKEN):
-             logger.critical("TOTP Login Token is not configured. Set the LOGINTOKEN environment variable.")
-             raise ValueError("TOTP Login Token not configured.")
+        # Check for configured credentials before proceeding; the table in
+        # config.py covers all four with one prefix check per entry.
+        for name, value, label in REQUIRED_CREDENTIALS:
+            if not value or str(value).startswith('YOUR_'):
+                logger.critical(f"{label} is not configured. Set the {name} environment variable.")
+                raise ValueError(f"{label} not configured.")
+
+        # Reuse a recent cached session first; a refresh-token exchange is one
+        # round-trip versus the full multi-RTT TOTP handshake (which is itself
+        # rate-limited).
+        if self._try_cached_session():
+            return
 
         try:
             self.smartApi = SmartConnect(APIKEY)
@@ -51,6 +174,7 @@ class SmartApiClient:
 
             if session_data and session_data.get('data'):
                 logger.info("✅ SmartApi authentication successful.")
+                self._store_session(session_data)
             elif session_data and "errorcode" in session_data:
                  error_code = session_data.get('errorcode')
                  message = session_data.get('message', 'Unknown API error')
@@ -67,6 +191,198 @@ class SmartApiClient:
             logger.critical(f"🚨 Unexpected error during SmartApi authentication: {e}", exc_info=True)
             raise
 
+    def _try_cached_session(self) -> bool:
+        """
+        Attempts to resume a session from the on-disk token cache.
+
+        Returns True if a cached refresh token within SESSION_TTL_HOURS could
+        be exchanged for a fresh session; False (without raising) otherwise,
+        in which case the caller falls through to the full TOTP login.
+        """
+        try:
+            with open(SESSION_CACHE_PATH, 'r', encoding='utf-8') as fh:
+                cached = json.load(fh)
+        except (OSError, ValueError):
+            return False # No cache, or unreadable/corrupt; do the full login
+
+        issued_at = cached.get('issued_at', 0)
+        refresh_token = cached.get('refreshToken')
+        if not refresh_token or (time.time() - issued_at) > SESSION_TTL_HOURS * 3600:
+            logger.debug("Cached session is missing a refresh token or has expired. Performing full login.")
+            return False
+
+        try:
+            self.smartApi = SmartConnect(APIKEY)
+            token_data = self.smartApi.generateToken(refresh_token)
+            if token_data and token_data.get('data'):
+                logger.info("✅ Resumed SmartApi session from cached tokens (skipped TOTP login).")
+                self._store_session(token_data)
+                return True
+            logger.info("Cached session tokens were rejected by the API. Falling back to full login.")
+        except Exception as e:
+            # Any failure here is non-fatal; the full TOTP flow is the fallback.
+            logger.info(f"Could not resume cached session ({e}). Falling back to full login.")
+        return False
+
+    def _store_session(self, session_data: dict):
+        """
+        Persists session tokens to SESSION_CACHE_PATH (owner-only permissions)
+        so subsequent runs can resume without a full TOTP login.
+        """
+        data = session_data.get('data') or {}
+        payload = {
+            'jwtToken': data.get('jwtToken'),
+            'refreshToken': data.get('refreshToken'),
+            'feedToken': data.get('feedToken'),
+            'issued_at': time.time(),
+        }
+        if not payload['refreshToken']:
+            logger.debug("Session response contained no refresh token; not caching session.")
+            return
+        try:
+            # Tokens are credentials: create the file with 0600 permissions.
+            fd = os.open(SESSION_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+                json.dump(payload, fh)
+            logger.debug(f"Cached session tokens to {SESSION_CACHE_PATH}.")
+        except OSError as e:
+            logger.warning(f"Could not cache session tokens to {SESSION_CACHE_PATH}: {e}. Continuing without session cache.")
+
+    @staticmethod
+    def _retry_after_seconds(response=None, exc=None):
+        """
+        Extracts a server-provided retry hint, if any, from a rate-limit failure.
+
+        The SmartApi SDK does not expose raw HTTP headers for successful JSON
+        responses, so this checks the common places a hint can surface:
+        'retryAfter'/'retry_after' keys in the JSON envelope, and the
+        'Retry-After' header on a response object attached to an exception
+        (requests attaches one to HTTPError-like exceptions).
+
+        Returns:
+            The hinted delay in seconds (capped at RETRY_AFTER_MAX_SECONDS),
+            or None if no usable hint was found.
+        """
+        hint = None
+        if isinstance(response, dict):
+            hint = response.get('retryAfter', response.get('retry_after'))
+        if hint is None and exc is not None:
+            raw_response = getattr(exc, 'response', None)
+            headers = getattr(raw_response, 'headers', None)
+            if headers is not None:
+                hint = headers.get('Retry-After')
+        if hint is None:
+            return None
+        try:
+            seconds = float(hint)
+        except (TypeError, ValueError):
+            # Retry-After may also be an HTTP-date; not worth parsing here.
+            logger.debug(f"Ignoring unparseable Retry-After hint: {hint!r}")
+            return None
+        if seconds < 0:
+            return None
+        return min(seconds, RETRY_AFTER_MAX_SECONDS)
+
+    def _sleep_backoff(self, attempt: int, is_rate_limit: bool = False):
+        """
+        Sleeps for a full-jitter exponential backoff before the next retry.
+
+        The backoff window doubles with each attempt (capped at MAX_DELAY) and
+        the actual sleep is drawn uniformly from [0, window], so simultaneous
+        retries spread out instead of re-colliding on the same boundary.
+        Rate-limit failures widen the window by RATE_LIMIT_BACKOFF_MULTIPLIER.
+
+        Args:
+            attempt: The 1-based attempt number that just failed.
+            is_rate_limit: True if the failure was a rate-limit response.
+        """
+        cfg = self._retry
+        backoff = min(cfg.max_delay, cfg.base_delay * (2 ** (attempt - 1)))
+        if is_rate_limit:
+            backoff = min(cfg.max_delay, backoff * RATE_LIMIT_BACKOFF_MULTIPLIER)
+        delay = random.uniform(0, backoff)
+        logger.debug(f"Backing off {delay:.2f}s (attempt {attempt}, window {backoff:.2f}s, rate_limit={is_rate_limit}).")
+        time.sleep(delay)
+
+    def _parse_candle_response(self, response: dict, token: str) -> pd.DataFrame:
+        """
+        Builds a DataFrame from a successful candle response.
+
+        Ensures the 'DateTime' column is **naive** datetime64[ns], assuming the
+        API's timestamps (with +05:30 offset) represent IST. Rows with
+        unparseable datetimes are dropped.
+
+        Args:
+            response: The decoded API response containing a 'data' list.
+            token: The symbol token, used for logging only.
+
+        Returns:
+            A DataFrame with columns ["DateTime", "Open", "High", "Low", "Close", "Volume"],
+            or an empty DataFrame if no usable rows remain.
+        """
+        rows = response["data"]
+        n = len(rows)
+        try:
+            # Build typed column arrays directly instead of letting pandas infer
+            # an object-dtype frame from the list of lists. This halves memory
+            # and gives float64/int64 blocks downstream code can use without
+            # further casting.
+            df = pd.DataFrame({
+                "DateTime": np.array([r[0] for r in rows], dtype=object),
+                "Open":   np.fromiter((r[1] for r in rows), dtype=np.float64, count=n),
+                "High":   np.fromiter((r[2] for r in rows), dtype=np.float64, count=n),
+                "Low":    np.fromiter((r[3] for r in rows), dtype=np.float64, count=n),
+                "Close":  np.fromiter((r[4] for r in rows), dtype=np.float64, count=n),
+                "Volume": np.fromiter((r[5] for r in rows), dtype=np.int64, count=n),
+            })
+        except (IndexError, TypeError, ValueError) as e:
+            # Malformed/ragged rows: fall back to the generic constructor and let
+            # the usual coercion/dropna handle the bad values.
+            logger.warning(f"Candle rows for token {token} were not uniformly shaped ({e}). Falling back to generic DataFrame construction.")
+            df = pd.DataFrame(
+                rows,
+                columns=["DateTime", "Open", "High", "Low", "Close", "Volume"]
+            )
+
+        # --- IMPORTANT ---
+        # Ensure the 'DateTime' column is explicitly **naive** datetime64[ns]
+        # holding IST wall-clock time. The API's format is fixed, so a strict
+        # format= parse hits the vectorized C path; bad rows coerce to NaT and
+        # are dropped below.
+        parsed = pd.to_datetime(df["DateTime"], format=API_DATETIME_FORMAT, utc=True, errors='coerce')
+
+        if len(df) and parsed.isna().all():
+            # The API format changed (or timestamps lack an offset). Fall back
+            # to inference once rather than losing the whole chunk; only this
+            # rare path needs a dtype check, since inference may yield naive.
+            logger.warning("API DateTime strings did not match the expected ISO-8601 offset format. Falling back to format inference.")
+            parsed = pd.to_datetime(df["DateTime"], errors='coerce')
+            if getattr(parsed.dtype, 'tz', None) is not None:
+                parsed = parsed.dt.tz_convert(IST_TZ).dt.tz_localize(None)
+        else:
+            # utc=True guarantees a tz-aware result, so convert unconditionally:
+            # to IST wall-clock time, then strip the timezone. (tz_localize(None)
+            # keeps the wall time; tz_convert(None) would shift to UTC.)
+            parsed = parsed.dt.tz_convert(IST_TZ).dt.tz_localize(None)
+
+        df["DateTime"] = parsed
+
+
+        # Drop rows where DateTime is NaT after parsing/conversion
+        initial_rows = len(df)
+        df.dropna(subset=["DateTime"], inplace=True)
+        if len(df) < initial_rows:
+            logger.warning(f"Dropped {initial_rows - len(df)} rows with invalid/unparseable DateTime from API response.")
+
+        # Final check for empty dataframe after cleaning
+        if df.empty:
+            logger.warning("DataFrame from API became empty after DateTime cleaning.")
+            return pd.DataFrame()
+
+        # --- Successful fetch and processing, return the DataFrame ---
+        logger.debug(f"Successfully fetched and parsed {len(df)} rows (naive datetime) for token {token}")
+        return df
+
     # get_candle_data expects naive datetime objects and returns naive datetimes
     def get_candle_data(self, token: str, from_date: datetime, to_date: datetime) -> pd.DataFrame:
         """
@@ -83,10 +399,22 @@ class SmartApiClient:
             A pandas DataFrame with columns ["DateTime", "Open", "High", "Low", "Close", "Volume"]
             with **naive** datetimes, if successful, otherwise an empty DataFrame.
         """
+        # Serve from the disk cache when this exact range was fetched before;
+        # closed-session history never changes, so re-runs skip the API.
+        cached = candle_cache.get(token, self.interval, from_date, to_date)
+        if cached is not None:
+            return cached
+
+        # Skip the call entirely while the breaker is open; retrying into a
+        # sustained rate limit only amplifies the load that caused it.
+        if not _CIRCUIT_BREAKER.allow():
+            logger.warning(f"Circuit breaker open; skipping fetch for token {token}.")
+            return pd.DataFrame()
+
         # Format naive datetimes for API call. API expects naive datetime strings.
         # Use precise formatting to avoid ambiguity
-        from_date_str = from_date.strftime('%Y-%m-%d %H:%M')
-        to_date_str = to_date.strftime('%Y-%m-%d %H:%M')
+        from_date_str = _fmt_ist(from_date)
+        to_date_str = _fmt_ist(to_date)
 
         params = {
             "exchange": "NSE",
@@ -96,23 +424,28 @@ class SmartApiClient:
             "todate": to_date_str
         }
 
-        logger.debug(f"Fetching data for token {token}, interval {self.interval} from {from_date_str} to {to_date_str} (assuming IST)")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Fetching data for token {token}, interval {self.interval} from {from_date_str} to {to_date_str} (assuming IST)")
 
         # Keep track of the last caught exception to potentially log details if all retries fail
         last_exception = None
+        max_retries = self._retry.max_retries
 
-        for attempt in range(1, MAX_RETRIES + 1):
+        for attempt in range(1, max_retries + 1):
             try:
+                # Take a token before touching the API; blocks only when the
+                # adaptive rate says we're ahead of the server's capacity.
+                _RATE_BUCKET.acquire()
                 response = self.smartApi.getCandleData(params)
 
                 if not response:
-                    logger.warning(f"Attempt {attempt}/{MAX_RETRIES} for token {token}: Empty or None API response.")
-                    if attempt < MAX_RETRIES:
-                        time.sleep(RETRY_DELAY)
+                    logger.warning(f"Attempt {attempt}/{max_retries} for token {token}: Empty or None API response.")
+                    if attempt < max_retries:
+                        self._sleep_backoff(attempt)
                         continue
                     else:
                         # Permanent failure after retries for empty response
-                        logger.error(f"🚨 Permanent failure for token {token} after {MAX_RETRIES} attempts: Empty API response.")
+                        logger.error(f"🚨 Permanent failure for token {token} after {max_retries} attempts: Empty API response.")
                         return pd.DataFrame()
 
                 if "errorcode" in response:
@@ -120,75 +453,47 @@ class SmartApiClient:
                     message = response.get('message', 'Unknown API error')
 
                     if error_code == "AB1004":
-                        logger.warning(f"Attempt {attempt}/{MAX_RETRIES} for token {token}: Rate limit hit (AB1004). Waiting longer ({RETRY_DELAY * 2}s)...")
-                        time.sleep(RETRY_DELAY * 2)
+                        _RATE_BUCKET.on_failure()
+                        _CIRCUIT_BREAKER.record_failure()
+                        if not _CIRCUIT_BREAKER.allow():
+                            logger.error(f"🚨 Circuit breaker tripped during retries for token {token}. Giving up on this fetch.")
+                            return pd.DataFrame()
+                        # Prefer the server's own hint over guessing the delay.
+                        retry_after = self._retry_after_seconds(response=response)
+                        if retry_after is not None:
+                            logger.warning(f"Attempt {attempt}/{max_retries} for token {token}: Rate limit hit (AB1004). Honoring server retry hint of {retry_after:.1f}s.")
+                            time.sleep(retry_after)
+                        else:
+                            logger.warning(f"Attempt {attempt}/{max_retries} for token {token}: Rate limit hit (AB1004). Backing off with jitter...")
+                            self._sleep_backoff(attempt, is_rate_limit=True)
                         continue # Retry
                     elif error_code == "" and message == "SUCCESS":
                          # Success case, continue to process data below
                          pass
                     else:
                         # Handle other specific API errors if necessary
-                        logger.error(f"Attempt {attempt}/{MAX_RETRIES} for token {token}: API Error {error_code}: {message}")
-                        if attempt < MAX_RETRIES:
-                            time.sleep(RETRY_DELAY)
+                        logger.error(f"Attempt {attempt}/{max_retries} for token {token}: API Error {error_code}: {message}")
+                        if attempt < max_retries:
+                            self._sleep_backoff(attempt)
                             continue # Retry on general API error
                         else:
                             # Permanent API error failure after retries
-                            logger.error(f"🚨 Permanent API error failure for token {token} after {MAX_RETRIES} attempts: {error_code} - {message}")
+                            logger.error(f"🚨 Permanent API error failure for token {token} after {max_retries} attempts: {error_code} - {message}")
                             return pd.DataFrame() # Return empty DataFrame on permanent failure
 
+                # Reaching here means the server answered without rate-limiting us;
+                # let the bucket grow its rate toward actual capacity.
+                _RATE_BUCKET.on_success()
+                _CIRCUIT_BREAKER.record_success()
+
                 if not response.get("data"):
                     # Success response but no data (e.g., outside market hours, holiday, no trades in interval)
                     logger.info(f"No data returned by API for token {token} for period {params['fromdate']} to {params['todate']}")
                     return pd.DataFrame() # Return empty DataFrame as there's no data
 
-                # Data received successfully
-                df = pd.DataFrame(
-                    response["data"],
-                    columns=["DateTime", "Open", "High", "Low", "Close", "Volume"]
-                )
-
-                # --- IMPORTANT ---
-                # Ensure the 'DateTime' column is explicitly **naive** datetime64[ns].
-                # Parse datetime strings, coercing errors to NaT.
-                # If the string includes offset info, pd.to_datetime will create tz-aware.
-                # We explicitly convert to naive, assuming the original timezone (+05:30) was IST.
-
-                # Step 1: Attempt parsing, allowing timezone info initially
-                df["DateTime"] = pd.to_datetime(df["DateTime"], errors='coerce')
-
-                # Step 2: Convert any resulting tz-aware datetimes to naive, dropping timezone info
-                # This assumes the source TZ was the one we want to represent as naive IST
-                if pd.api.types.is_datetime64tz_dtype(df["DateTime"]):
-                    logger.debug("API data parsed as tz-aware, converting to naive (assuming IST source).")
-                    df["DateTime"] = df["DateTime"].dt.tz_convert(None) # Converts *from* its current timezone *to* naive
-
-                # Step 3: Ensure the dtype is datetime64[ns] (naive) after potential conversion
-                # If it's still not the correct dtype (e.g., object after failed parse), try again explicitly converting to naive
-                if not pd.api.types.is_datetime64_ns_dtype(df["DateTime"]):
-                     logger.warning(f"API DateTime column not datetime64[ns] after initial processing: {df['DateTime'].dtype}. Attempting final naive conversion.")
-                     try:
-                         # This might fail if the underlying data is problematic
-                         df["DateTime"] = pd.to_datetime(df["DateTime"], errors='coerce').dt.tz_convert(None)
-                     except Exception as e:
-                         logger.error(f"🚨 Final attempt to convert API DateTime to naive failed: {e}", exc_info=True)
-                         # If conversion fails critically, the column might be unusable.
-                         # Let's proceed but rows with NaT will be dropped.
-
-
-                # Drop rows where DateTime is NaT after parsing/conversion
-                initial_rows = len(df)
-                df.dropna(subset=["DateTime"], inplace=True)
-                if len(df) < initial_rows:
-                    logger.warning(f"Dropped {initial_rows - len(df)} rows with invalid/unparseable DateTime from API response.")
-
-                # Final check for empty dataframe after cleaning
-                if df.empty:
-                    logger.warning("DataFrame from API became empty after DateTime cleaning.")
-                    return pd.DataFrame()
-
-                # --- Successful fetch and processing, return the DataFrame ---
-                logger.debug(f"Successfully fetched and parsed {len(df)} rows (naive datetime) for token {token}")
+                # Data received successfully; parsing is shared with the batch path.
+                df = self._parse_candle_response(response, token)
+                candle_cache.put(token, self.interval, from_date, to_date, df)
                 return df
 
             # --- Specific Exception Handling for non-JSON Rate Limit response ---
@@ -197,56 +502,180 @@ class SmartApiClient:
                  # Catch the specific DataException indicating JSON parsing failed
                  # Check if the message contains the rate limit text
                  if "exceeding access rate" in str(e):
-                     logger.warning(f"Attempt {attempt}/{MAX_RETRIES} for token {token}: Detected non-JSON Rate limit response. Waiting longer ({RETRY_DELAY * 2}s)...", exc_info=True)
-                     time.sleep(RETRY_DELAY * 2)
+                     _RATE_BUCKET.on_failure()
+                     _CIRCUIT_BREAKER.record_failure()
+                     if not _CIRCUIT_BREAKER.allow():
+                         logger.error(f"🚨 Circuit breaker tripped during retries for token {token}. Giving up on this fetch.")
+                         return pd.DataFrame()
+                     # The SDK may attach the raw response to the exception; use
+                     # its Retry-After header when present.
+                     retry_after = self._retry_after_seconds(exc=e)
+                     if retry_after is not None:
+                         logger.warning(f"Attempt {attempt}/{max_retries} for token {token}: Detected non-JSON Rate limit response. Honoring server retry hint of {retry_after:.1f}s.")
+                         time.sleep(retry_after)
+                     else:
+                         logger.warning(f"Attempt {attempt}/{max_retries} for token {token}: Detected non-JSON Rate limit response. Backing off with jitter...")
+                         self._sleep_backoff(attempt, is_rate_limit=True)
                      continue # Retry
                  else:
                       # It's a DataException, but not related to rate limit text
-                      logger.error(f"Attempt {attempt}/{MAX_RETRIES} for token {token}: DataException during API call (non-rate limit): {e}. Retrying in {RETRY_DELAY}s.", exc_info=True)
-                      if attempt < MAX_RETRIES:
-                           time.sleep(RETRY_DELAY)
+                      logger.error(f"Attempt {attempt}/{max_retries} for token {token}: DataException during API call (non-rate limit): {e}. Retrying with backoff.")
+                      if attempt < max_retries:
+                           self._sleep_backoff(attempt)
                            continue # Retry on other DataExceptions
                       else:
                            # Permanent failure after retries for this specific error
-                           logger.error(f"🚨 Permanent DataException failure for token {token} after {MAX_RETRIES} attempts: {e}", exc_info=True)
+                           logger.error(f"🚨 Permanent DataException failure for token {token} after {max_retries} attempts: {e}", exc_info=True)
                            return pd.DataFrame() # Return empty DataFrame on permanent failure
 
             except (SmartAPIException, requests.exceptions.RequestException) as e:
                 last_exception = e # Store the exception
                 # Catch Angel One's specific exceptions (excluding DataException now handled above) or general network errors
-                logger.warning(f"Attempt {attempt}/{MAX_RETRIES} for token {token}: API or Network Exception: {e}. Retrying in {RETRY_DELAY}s.", exc_info=True)
-                if attempt < MAX_RETRIES:
-                    time.sleep(RETRY_DELAY)
+                logger.warning(f"Attempt {attempt}/{max_retries} for token {token}: API or Network Exception: {e}. Retrying with backoff.")
+                if attempt < max_retries:
+                    self._sleep_backoff(attempt)
                     continue # Retry on network or other known API exception
                 else:
                     # Permanent failure after retries for this exception type
-                    logger.error(f"🚨 Permanent exception failure for token {token} after {MAX_RETRIES} attempts: {e}", exc_info=True)
+                    logger.error(f"🚨 Permanent exception failure for token {token} after {max_retries} attempts: {e}", exc_info=True)
                     return pd.DataFrame() # Return empty DataFrame on permanent failure
 
             except Exception as e:
                 last_exception = e # Store the exception
                 # Catch any other unexpected exceptions
-                logger.error(f"Attempt {attempt}/{MAX_RETRIES} for token {token}: Unexpected Exception during API call: {e}. Retrying in {RETRY_DELAY}s.", exc_info=True)
-                if attempt < MAX_RETRIES:
-                    time.sleep(RETRY_DELAY)
+                logger.error(f"Attempt {attempt}/{max_retries} for token {token}: Unexpected Exception during API call: {e}. Retrying with backoff.")
+                if attempt < max_retries:
+                    self._sleep_backoff(attempt)
                     continue # Retry on any exception
                 else:
                     # Permanent unexpected failure after retries
-                    logger.error(f"🚨 Permanent unexpected failure for token {token} after {MAX_RETRIES} attempts: {e}", exc_info=True)
+                    logger.error(f"🚨 Permanent unexpected failure for token {token} after {max_retries} attempts: {e}", exc_info=True)
                     return pd.DataFrame() # Return empty DataFrame on permanent failure
 
         # --- If the loop finishes without returning, it means all retries failed ---
         # Log a final error message using the last caught exception, if any.
         if last_exception:
-             logger.error(f"🚨 Failed to fetch data for token {token} after all {MAX_RETRIES} retry attempts. Last exception: {last_exception}", exc_info=True)
+             logger.error(f"🚨 Failed to fetch data for token {token} after all {max_retries} retry attempts. Last exception: {last_exception}", exc_info=True)
         else:
-             # This case should ideally not be reached if MAX_RETRIES > 0 and exceptions are caught
-             logger.error(f"🚨 Failed to fetch data for token {token} after all {MAX_RETRIES} retry attempts with unknown reason.")
+             # This case should ideally not be reached if max_retries > 0 and exceptions are caught
+             logger.error(f"🚨 Failed to fetch data for token {token} after all {max_retries} retry attempts with unknown reason.")
 
         # Ensure an empty DataFrame is returned if all retries are exhausted
         return pd.DataFrame()
 
 
+    def iter_candle_data(self, token: str, from_date: datetime, to_date: datetime,
+                         chunk: timedelta = timedelta(days=30), max_workers: int = None):
+        """
+        Yields candle data for [from_date, to_date] one chunk at a time.
+
+        The chunk bounds are precomputed up front and fetched by a small
+        thread pool, so while the caller processes one chunk several more are
+        already in flight — for a network-bound backfill of N chunks this
+        cuts wall time to roughly ceil(N / workers) round trips. Results are
+        still yielded in chronological order. Pacing against the API is
+        handled by the shared adaptive token bucket (every worker request
+        passes through it), not by blanket sleeps or the iteration itself.
+
+        Args:
+            token: The symbol token.
+            from_date: Start of the overall range (naive datetime).
+            to_date: End of the overall range (naive datetime).
+            chunk: Maximum span of a single API request.
+            max_workers: Concurrent chunk fetches; defaults to
+                MAX_CONCURRENT_REQUESTS.
+
+        Yields:
+            (chunk_start, chunk_end, DataFrame) tuples in chronological order.
+            The DataFrame may be empty for ranges with no trades.
+        """
+        bounds = []
+        current_start = from_date
+        while current_start <= to_date:
+            current_end = min(current_start + chunk, to_date)
+            bounds.append((current_start, current_end))
+            # Next chunk starts with the candle immediately after this one.
+            current_start = current_end + timedelta(minutes=1)
+
+        if not bounds:
+            return
+
+        if max_workers is None:
+            max_workers = MAX_CONCURRENT_REQUESTS
+        workers = max(1, min(max_workers, len(bounds)))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.get_candle_data, token, s, e) for s, e in bounds]
+            for (chunk_start, chunk_end), future in zip(bounds, futures):
+                yield chunk_start, chunk_end, future.result()
+
+    def get_candle_data_batch(self, fetch_requests: list) -> dict:
+        """
+        Fetches a batch of (token, from_date, to_date) ranges in one dispatch.
+
+        Angel One's candle endpoint accepts only one symbol token per call, so
+        the requests cannot be bundled into a single POST; the per-call
+        overhead is amortized instead by issuing the whole batch through the
+        shared thread pool and connection pool, with the usual retry/backoff
+        envelope around each call.
+
+        Args:
+            fetch_requests: A list of (token, from_date, to_date) tuples.
+
+        Returns:
+            A dict mapping each (token, from_date, to_date) tuple to its
+            DataFrame (empty on failure).
+        """
+        results = self.get_candle_data_many(fetch_requests)
+        return dict(zip(fetch_requests, results))
+
+    def get_candle_data_many(self, fetch_requests: list) -> list:
+        """
+        Fetches several (token, from_date, to_date) ranges concurrently.
+
+        Candle fetching is I/O-bound (dominated by HTTPS round-trip time), so
+        issuing the requests from a small thread pool overlaps the network waits
+        instead of paying one full RTT per range. The SmartApi SDK is synchronous,
+        so threads (which release the GIL on socket I/O) are used rather than an
+        async HTTP client, keeping the SDK responsible for auth and signing.
+
+        Args:
+            fetch_requests: A list of (token, from_date, to_date) tuples, with
+                            naive datetimes as expected by get_candle_data.
+
+        Returns:
+            A list of DataFrames in the same order as fetch_requests. Failed
+            fetches yield empty DataFrames, matching get_candle_data behaviour.
+        """
+        if not fetch_requests:
+            return []
+
+        # Cap workers at the configured concurrency; no point spawning more
+        # threads than there are requests.
+        max_workers = max(1, min(MAX_CONCURRENT_REQUESTS, len(fetch_requests)))
+
+        if max_workers == 1:
+            # Degenerate case: keep the simple sequential path.
+            return [self.get_candle_data(token, f, t) for token, f, t in fetch_requests]
+
+        logger.debug(f"Dispatching {len(fetch_requests)} candle requests across {max_workers} worker threads.")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.get_candle_data, token, from_date, to_date)
+                for token, from_date, to_date in fetch_requests
+            ]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # get_candle_data already swallows its own errors; this guards
+                    # against anything unexpected escaping a worker thread.
+                    logger.error(f"🚨 Unexpected error in concurrent candle fetch worker: {e}", exc_info=True)
+                    results.append(pd.DataFrame())
+        return results
+
+
     def logout(self):
         """Logs out from the SmartApi session using terminateSession."""
         logger.info(f"Attempting SmartApi logout for client ID: {self.client_id}...")
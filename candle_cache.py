@@ -0,0 +1,101 @@
+# candle_cache.py
+import os
+import hashlib
+import logging
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from config import (
+    CACHE_ENABLED, CACHE_DIR, CACHE_LIVE_TTL_SECONDS, CACHE_MAX_ENTRIES
+)
+
+logger = logging.getLogger(__name__)
+
+# Historical candles for closed sessions never change, so cached entries whose
+# range ends before today are kept indefinitely; entries touching today's
+# session expire after CACHE_LIVE_TTL_SECONDS.
+
+def _cache_key(token: str, interval: str, from_date: datetime, to_date: datetime) -> str:
+    """Builds a stable filename key for a (token, interval, range) request."""
+    raw = f"{token}|{interval}|{from_date.isoformat()}|{to_date.isoformat()}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _cache_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}.pkl")
+
+
+def _is_immutable(to_date: datetime) -> bool:
+    """True if the requested range ends before today (closed sessions only)."""
+    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return to_date < today_start
+
+
+def get(token: str, interval: str, from_date: datetime, to_date: datetime):
+    """
+    Returns the cached DataFrame for this request, or None on a miss.
+
+    Entries covering only closed sessions never expire; entries touching the
+    current session are considered stale after CACHE_LIVE_TTL_SECONDS.
+    """
+    if not CACHE_ENABLED:
+        return None
+
+    path = _cache_path(_cache_key(token, interval, from_date, to_date))
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None # Miss
+
+    if not _is_immutable(to_date) and (time.time() - mtime) > CACHE_LIVE_TTL_SECONDS:
+        logger.debug(f"Cache entry for token {token} expired (live-range TTL). Refetching.")
+        return None
+
+    try:
+        df = pd.read_pickle(path)
+        # Touch the file so LRU pruning treats it as recently used.
+        os.utime(path, None)
+        logger.debug(f"Cache hit for token {token} ({from_date} -> {to_date}), {len(df)} rows.")
+        # Return a copy so callers can mutate freely without corrupting the cache.
+        return df.copy()
+    except Exception as e:
+        logger.warning(f"Failed to read cache entry {path}: {e}. Treating as miss.")
+        return None
+
+
+def put(token: str, interval: str, from_date: datetime, to_date: datetime, df: pd.DataFrame):
+    """Stores a parsed candle DataFrame for this request. Failures are non-fatal."""
+    if not CACHE_ENABLED or df is None or df.empty:
+        return
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        path = _cache_path(_cache_key(token, interval, from_date, to_date))
+        df.to_pickle(path)
+        logger.debug(f"Cached {len(df)} rows for token {token} ({from_date} -> {to_date}).")
+        _prune()
+    except Exception as e:
+        logger.warning(f"Failed to write cache entry for token {token}: {e}. Continuing without caching.")
+
+
+def _prune():
+    """Evicts least-recently-used entries when the cache exceeds CACHE_MAX_ENTRIES."""
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            entries = [(entry.stat().st_mtime, entry.path) for entry in it if entry.name.endswith('.pkl')]
+    except OSError:
+        return
+
+    excess = len(entries) - CACHE_MAX_ENTRIES
+    if excess <= 0:
+        return
+
+    entries.sort() # Oldest mtime (least recently used) first
+    for _, path in entries[:excess]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass # Entry may have been removed concurrently; nothing to do
+    logger.debug(f"Pruned {excess} least-recently-used cache entries.")
@@ -1,5 +1,6 @@
 # config.py
 import os
+from dataclasses import dataclass
 
 # --- API Credentials ---
 # It's strongly recommended to set these as environment variables for production.
@@ -15,15 +16,18 @@ CLIENTID = os.getenv('CLIENTID', 'YOUR_CLIENTID_PLACEHOLDER')
 PASSWORD = os.getenv('PASSWORD', 'YOUR_PIN_PLACEHOLDER')
 LOGINTOKEN = os.getenv('LOGINTOKEN', 'YOUR_TOTP_LOGINTOKEN_PLACEHOLDER')
 
-# Check if placeholders are still present (basic check). Use explicit checks for None too.
-if APIKEY is None or 'YOUR_APIKEY_PLACEHOLDER' in str(APIKEY):
-    print("WARNING: API Key is not configured. Set the APIKEY environment variable for production use.")
-if CLIENTID is None or 'YOUR_CLIENTID_PLACEHOLDER' in str(CLIENTID):
-    print("WARNING: Client ID is not configured. Set the CLIENTID environment variable for production use.")
-if PASSWORD is None or 'YOUR_PIN_PLACEHOLDER' in str(PASSWORD):
-    print("WARNING: Password/PIN is not configured. Set the PASSWORD environment variable for production use.")
-if LOGINTOKEN is None or 'YOUR_TOTP_LOGINTOKEN_PLACEHOLDER' in str(LOGINTOKEN):
-    print("WARNING: TOTP Login Token is not configured. Set the LOGINTOKEN environment variable for production use.")
+# Required credentials: (env var name, value, human-readable label).
+# All placeholder defaults start with 'YOUR_', so one prefix check covers them.
+REQUIRED_CREDENTIALS = (
+    ('APIKEY', APIKEY, 'API Key'),
+    ('CLIENTID', CLIENTID, 'Client ID'),
+    ('PASSWORD', PASSWORD, 'Password/PIN'),
+    ('LOGINTOKEN', LOGINTOKEN, 'TOTP Login Token'),
+)
+
+for _name, _value, _label in REQUIRED_CREDENTIALS:
+    if not _value or str(_value).startswith('YOUR_'):
+        print(f"WARNING: {_label} is not configured. Set the {_name} environment variable for production use.")
 
 
 # --- Endpoints ---
@@ -38,8 +42,78 @@ TIME_INTERVAL = os.getenv('TIME_INTERVAL', 'ONE_HOUR')
 # --- Retry and Delay Settings ---
 MAX_RETRIES = int(os.getenv('MAX_RETRIES', 5))
 RETRY_DELAY = int(os.getenv('RETRY_DELAY', 1))       # seconds between API retries on *same request* failure
+
+# --- Backoff Settings ---
+# Retries use full-jitter exponential backoff: the sleep before attempt N is a
+# random value in [0, min(MAX_DELAY, BASE_DELAY * 2**(N-1))]. Jitter spreads
+# retries out so many concurrent requests don't all re-collide on the same
+# boundary after a rate-limit response.
+BASE_DELAY = float(os.getenv('BASE_DELAY', RETRY_DELAY))  # seconds, first-attempt backoff cap
+MAX_DELAY = float(os.getenv('MAX_DELAY', 30.0))           # seconds, upper bound on any single backoff
 REQUEST_DELAY = float(os.getenv('REQUEST_DELAY', 0.25))  # seconds between requests for different chunks/symbols
 
+@dataclass(frozen=True)
+class RetryConfig:
+    """
+    Immutable snapshot of the retry/backoff settings, built once at import.
+
+    The client stores this on an attribute and reads it inside the retry loop,
+    replacing repeated module-global lookups on the hot path and giving the
+    settings a typed, self-documenting shape.
+    """
+    max_retries: int
+    base_delay: float
+    max_delay: float
+    request_delay: float
+
+RETRY_CONFIG = RetryConfig(
+    max_retries=MAX_RETRIES,
+    base_delay=BASE_DELAY,
+    max_delay=MAX_DELAY,
+    request_delay=REQUEST_DELAY,
+)
+
+# --- Circuit Breaker Settings ---
+# After this many consecutive rate-limit failures, stop issuing API calls
+# entirely for the cool-down period instead of burning retries per token.
+CB_FAILURE_THRESHOLD = int(os.getenv('CB_FAILURE_THRESHOLD', 10))
+CB_OPEN_SECONDS = float(os.getenv('CB_OPEN_SECONDS', 60))
+
+# Hard ceiling on the adaptive request rate (requests/second). Angel One
+# documents 3 req/s for the historical candle endpoint; the adaptive limiter
+# probes up to this cap instead of discovering it by triggering throttles.
+MAX_REQUESTS_PER_SECOND = float(os.getenv('MAX_REQUESTS_PER_SECOND', 3.0))
+
+# --- Concurrency Settings ---
+# Maximum number of candle requests in flight at once when fetching multiple
+# (token, date-range) chunks. Keep this small to respect Angel One rate limits.
+MAX_CONCURRENT_REQUESTS = int(os.getenv('MAX_CONCURRENT_REQUESTS', 4))
+
+# Number of symbols processed concurrently in main. Symbol processing is
+# I/O-bound (HTTP and Parquet I/O both release the GIL); aggregate API pacing
+# is still enforced by the shared adaptive rate limiter regardless of workers.
+SYMBOL_WORKERS = int(os.getenv('SYMBOL_WORKERS', 8))
+
+# --- Session Cache Settings ---
+# Angel One sessions stay valid for the trading day; persisting the tokens lets
+# repeat runs refresh the session instead of doing the full TOTP login.
+SESSION_CACHE_PATH = os.getenv('SESSION_CACHE_PATH', os.path.join(os.path.expanduser('~'), '.angel_session.json'))
+SESSION_TTL_HOURS = float(os.getenv('SESSION_TTL_HOURS', 8))
+
+# --- Candle Response Cache Settings ---
+# Historical bars for closed sessions are immutable, so caching fetched ranges
+# on disk lets incremental re-runs skip the API entirely for overlapping ranges.
+CACHE_ENABLED = os.getenv('CACHE_ENABLED', '1') not in ('0', 'false', 'False')
+CACHE_DIR = os.getenv('CACHE_DIR', '.candle_cache')
+CACHE_LIVE_TTL_SECONDS = int(os.getenv('CACHE_LIVE_TTL_SECONDS', 60))  # TTL for ranges touching today's session
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 4096))          # LRU eviction threshold
+
+# --- Symbol List Cache Settings ---
+# The NSE Nifty 50 constituents and the Angel One instrument master change at
+# most daily; caching them skips two HTTP fetches and tens of MB of JSON
+# parsing on repeat runs within the TTL.
+SYMBOL_CACHE_TTL_HOURS = float(os.getenv('SYMBOL_CACHE_TTL_HOURS', 24))
+
 # --- Data Storage Settings ---
 # Base folder name, interval will be appended
 BASE_FOLDER_NAME = "NIFTY_50_DATA"
@@ -49,6 +123,10 @@ FOLDER_NAME = f"{BASE_FOLDER_NAME}_{TIME_INTERVAL.upper()}" # Ensure uppercase c
 CSV_EXTENSION = ".csv"
 PARQUET_EXTENSION = ".parquet"
 
+# Parquet is the primary storage format. Set CSV_EXPORT_ENABLED=1 to also
+# write a CSV copy of each symbol's data (slower saves, larger on disk).
+CSV_EXPORT_ENABLED = os.getenv('CSV_EXPORT_ENABLED', '0') not in ('0', 'false', 'False')
+
 # --- Time Parameters ---
 # Starting date for fetching historical data (YYYY-MM-DD). Data before this date is not fetched.
 START_DATE = os.getenv('START_DATE', "2016-10-01")
@@ -1,104 +1,147 @@
 # data_manager.py
 import os
-import time
+import threading
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import logging
 
 from config import (
     FOLDER_NAME, CSV_EXTENSION, PARQUET_EXTENSION,
-    REQUEST_DELAY, START_DATE
+    CSV_EXPORT_ENABLED, START_DATE
 )
-from data_utils import clean_ohlcv
+from data_utils import clean_ohlcv, ensure_naive_dt
 from api_client import SmartApiClient
 
 logger = logging.getLogger(__name__)
 
+# Copy-on-write defers block copies until a write actually happens, so frames
+# can be handed to clean_ohlcv (which copies internally) without a defensive
+# up-front .copy() doubling memory. The option doesn't exist on old pandas;
+# skipping it there is harmless because of that internal copy.
+try:
+    pd.set_option('mode.copy_on_write', True)
+except Exception:
+    pass
+
+# pyarrow is optional (see requirements.txt) but powers Parquet I/O, the
+# incremental row-group append and the typed CSV reader. Import it once at
+# module scope instead of inside every save/read call.
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+    _HAS_PYARROW = True
+except ImportError:
+    pa = pacsv = pq = None
+    _HAS_PYARROW = False
+
+# Set once the data folder has been created, so save_data only pays the
+# mkdir syscall on the first symbol of a run instead of on every save.
+_FOLDER_READY = False
+
+
+def _paths(symbol: str):
+    """Returns the (csv_filename, parquet_filename) pair for a symbol."""
+    return (os.path.join(FOLDER_NAME, f"{symbol}{CSV_EXTENSION}"),
+            os.path.join(FOLDER_NAME, f"{symbol}{PARQUET_EXTENSION}"))
+
+
+def _exists(path: str) -> bool:
+    """Single-stat existence check; callers capture the result once per file."""
+    try:
+        os.stat(path)
+        return True
+    except OSError:
+        return False
+
+def _peek_last_datetime(parquet_filename: str):
+    """
+    Returns the max DateTime stored in a Parquet file by reading only the
+    footer statistics of the last row group — a few KB of I/O, no column
+    decode. Appends always add newer rows, so the last row group carries the
+    global maximum. Returns None when the file/stats are unavailable.
+    """
+    if not _HAS_PYARROW or not _exists(parquet_filename):
+        return None
+    try:
+        pf = pq.ParquetFile(parquet_filename)
+        if pf.num_row_groups == 0:
+            return None
+        dt_idx = pf.schema_arrow.get_field_index('DateTime')
+        if dt_idx < 0:
+            return None
+        stats = pf.metadata.row_group(pf.num_row_groups - 1).column(dt_idx).statistics
+        if stats is None or not stats.has_min_max:
+            return None
+        return pd.Timestamp(stats.max)
+    except Exception as e:
+        logger.debug("Parquet footer peek failed for %s: %s.", parquet_filename, e)
+        return None
+
+
+def _read_csv_typed(csv_filename: str) -> pd.DataFrame:
+    """
+    Reads a legacy CSV with pyarrow's vectorized C++ parser and an explicit
+    typed schema (naive timestamp DateTime, float OHLC, integer Volume), so
+    timestamps arrive as naive datetime64[ns] without a pandas re-parse.
+    Falls back to plain pd.read_csv when pyarrow is unavailable or the file
+    does not match the expected layout (e.g. old Date/Time format).
+    """
+    if not _HAS_PYARROW:
+        return pd.read_csv(csv_filename)
+
+    try:
+        convert_options = pacsv.ConvertOptions(column_types={
+            'DateTime': pa.timestamp('ns'),
+            'Open': pa.float64(),
+            'High': pa.float64(),
+            'Low': pa.float64(),
+            'Close': pa.float64(),
+            'Volume': pa.int64(),
+        })
+        return pacsv.read_csv(csv_filename, convert_options=convert_options).to_pandas()
+    except Exception as e:
+        logger.debug("pyarrow CSV parse failed for %s (%s). Falling back to pandas read_csv.", csv_filename, e)
+        return pd.read_csv(csv_filename)
+
+
 def read_existing_data(symbol: str) -> pd.DataFrame:
     """
-    Reads existing data for a symbol, preferring CSV, falling back to Parquet.
+    Reads existing data for a symbol, preferring Parquet, falling back to CSV.
     Attempts to parse DateTime into **naive datetime64[ns]**.
     Returns a DataFrame with a **naive datetime64[ns]** 'DateTime' column, or empty DataFrame.
     Applies minimal cleaning initially (parsing/dropna, basic OHLCV).
     Assumes datetimes in files are intended as IST.
     Ensures returned DataFrame has a naive 'DateTime' column of dtype datetime64[ns].
     """
-    csv_filename = os.path.join(FOLDER_NAME, f"{symbol}{CSV_EXTENSION}")
-    parquet_filename = os.path.join(FOLDER_NAME, f"{symbol}{PARQUET_EXTENSION}")
+    csv_filename, parquet_filename = _paths(symbol)
+    # Stat each candidate file exactly once up front.
+    parquet_file_exists = _exists(parquet_filename)
+    csv_file_exists = _exists(csv_filename)
     existing_data = pd.DataFrame()
     data_read_attempted = False # Flag to know if we tried reading any file
 
-    # 1. Try reading from CSV first (Primary)
-    if os.path.exists(csv_filename):
+    # 1. Try reading from Parquet first (Primary).
+    # Parquet preserves the naive datetime64[ns] dtype, so the fast path skips
+    # the text re-parse and tz reconciliation the CSV path needs.
+    if parquet_file_exists:
         data_read_attempted = True
-        logger.info(f"Attempting to read existing data for {symbol} from CSV: {csv_filename}")
+        logger.info("Attempting to read existing data for %s from Parquet: %s", symbol, parquet_filename)
         try:
-            existing_data = pd.read_csv(csv_filename)
-            logger.info(f"Read {len(existing_data)} rows from {csv_filename}.")
-
-            # --- IMPORTANT ---
-            # Handle date/time parsing and explicitly ensure **naive** datetime64[ns].
-            if "DateTime" in existing_data.columns:
-                existing_data["DateTime"] = pd.to_datetime(existing_data["DateTime"], errors='coerce')
-                # If it parsed as tz-aware, convert to naive. Assumes original TZ was IST.
-                if pd.api.types.is_datetime64tz_dtype(existing_data["DateTime"]):
-                     logger.debug(f"CSV DateTime column for {symbol} read as tz-aware. Converting to naive.")
-                     existing_data["DateTime"] = existing_data["DateTime"].dt.tz_convert(None)
-                # If not datetime64[ns] after parse, attempt a final naive conversion
-                elif not pd.api.types.is_datetime64_ns_dtype(existing_data["DateTime"]):
-                    logger.warning(f"CSV DateTime column for {symbol} not datetime64[ns] after parse: {existing_data['DateTime'].dtype}. Attempting re-parse to naive.")
-                    # Use errors='coerce' in the re-parse as well
-                    existing_data["DateTime"] = pd.to_datetime(existing_data["DateTime"], errors='coerce').dt.tz_convert(None)
-
-
-            elif "Date" in existing_data.columns and "Time" in existing_data.columns:
-                # Support old format and reconstruct DateTime to **naive**
-                existing_data["DateTime"] = pd.to_datetime(existing_data["Date"] + " " + existing_data["Time"], errors='coerce')
-                existing_data.drop(columns=["Date", "Time"], errors='ignore', inplace=True)
+            # Parquet should ideally save/load with correct dtypes including datetime.
+            # Prune to the columns downstream code actually uses — skipping a
+            # column's chunks avoids decompressing and decoding them at all.
+            required_read_cols = ['DateTime', 'Open', 'High', 'Low', 'Close', 'Volume']
+            schema_names = set(pq.ParquetFile(parquet_filename).schema.names) if _HAS_PYARROW else set()
+            if 'DateTime' in schema_names:
+                cols = [c for c in required_read_cols if c in schema_names]
+                existing_data = pd.read_parquet(parquet_filename, columns=cols, engine='pyarrow')
             else:
-                logger.warning(f"Existing CSV for {symbol} in {FOLDER_NAME} does not have 'DateTime' or 'Date'/'Time' columns. Cannot use this file.")
-                existing_data = pd.DataFrame() # Cannot use CSV
-
-            # Check if DateTime column exists and is not all null AND is the correct naive dtype
-            if "DateTime" in existing_data.columns and pd.api.types.is_datetime64_ns_dtype(existing_data["DateTime"]) and not existing_data["DateTime"].isnull().all():
-                 # CSV read successfully and has valid naive DateTime
-                 # Now check for essential OHLCV columns
-                 ohlcv_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
-                 if all(col in existing_data.columns for col in ohlcv_cols):
-                      # Data is usable from CSV
-                      data_read_attempted = False # Reset to prevent fallback to Parquet if CSV was good
-                      pass # CSV is good, proceed to basic cleaning below
-                 else:
-                      missing_ohlcv = [col for col in ohlcv_cols if col not in existing_data.columns]
-                      logger.warning(f"CSV file for {symbol} has DateTime but missing essential OHLCV columns: {missing_ohlcv}. Will try Parquet if available.")
-                      existing_data = pd.DataFrame() # Treat as unusable CSV
-                      # data_read_attempted remains True to signal we tried CSV
-
-            else:
-                 # If DateTime column is missing, all null, or wrong dtype after CSV processing
-                 if "DateTime" in existing_data.columns:
-                     logger.warning(f"CSV file for {symbol} has unusable DateTime column (all null or wrong dtype: {existing_data['DateTime'].dtype}) after parsing. Will try Parquet if available.")
-                 else:
-                     logger.warning(f"CSV file for {symbol} has no DateTime column after parsing. Will try Parquet if available.")
-                 existing_data = pd.DataFrame() # Treat as failed read if DateTime is bad
-                 # data_read_attempted remains True to signal we tried CSV
-
-
-        except Exception as e:
-            logger.error(f"🚨 Error reading CSV file for {symbol} from {csv_filename}: {e}. Falling back to Parquet.", exc_info=True)
-            existing_data = pd.DataFrame() # Clear data frame
-            # data_read_attempted remains True to signal we tried CSV
-
-
-    # 2. If CSV failed or doesn't exist/was unusable, try reading from Parquet (Fallback)
-    # Only attempt if CSV wasn't usable (existing_data is empty) AND Parquet exists
-    if existing_data.empty and os.path.exists(parquet_filename):
-        data_read_attempted = True # Mark that we are attempting Parquet
-        logger.info(f"Attempting to read existing data for {symbol} from Parquet: {parquet_filename}")
-        try:
-            # Parquet should ideally save/load with correct dtypes including datetime
-            existing_data = pd.read_parquet(parquet_filename)
-            logger.info(f"Read {len(existing_data)} rows from {parquet_filename}.")
+                # Old 'Date'/'Time' format (or no pyarrow schema probe): read
+                # everything so the reconstruction below has what it needs.
+                existing_data = pd.read_parquet(parquet_filename)
+            logger.info("Read %d rows from %s.", len(existing_data), parquet_filename)
 
             # --- IMPORTANT ---
             # Ensure 'DateTime' column exists and is **naive** datetime64[ns] after reading Parquet
@@ -111,16 +154,9 @@ def read_existing_data(symbol: str) -> pd.DataFrame:
                       logger.error(f"Parquet file for {symbol} is missing 'DateTime' and 'Date'/'Time' columns. Cannot use this file.")
                       existing_data = pd.DataFrame() # Cannot use Parquet
             else:
-                 # Ensure the 'DateTime' column is actually datetime type after reading
-                 existing_data['DateTime'] = pd.to_datetime(existing_data['DateTime'], errors='coerce')
-                 # Convert to naive if it somehow came in as tz-aware
-                 if pd.api.types.is_datetime64tz_dtype(existing_data["DateTime"]):
-                      logger.debug(f"Parquet DateTime column for {symbol} read as tz-aware. Converting to naive.")
-                      existing_data["DateTime"] = existing_data["DateTime"].dt.tz_convert(None)
-                 # If not datetime64[ns] after parse, attempt a final naive conversion
-                 elif not pd.api.types.is_datetime64_ns_dtype(existing_data["DateTime"]):
-                    logger.warning(f"Parquet DateTime column for {symbol} not datetime64[ns] after parse: {existing_data['DateTime'].dtype}. Attempting re-parse to naive.")
-                    existing_data["DateTime"] = pd.to_datetime(existing_data["DateTime"], errors='coerce').dt.tz_convert(None)
+                 # Normalize to naive datetime64[ns] in one helper call; a
+                 # no-op dtype check on the common already-naive path.
+                 existing_data['DateTime'] = ensure_naive_dt(existing_data['DateTime'])
 
 
             # Check if DateTime column exists and is not all null AFTER processing Parquet
@@ -146,7 +182,58 @@ def read_existing_data(symbol: str) -> pd.DataFrame:
 
 
         except Exception as e:
-            logger.error(f"🚨 Error reading Parquet file for {symbol} from {parquet_filename}: {e}. Treating as no existing data.", exc_info=True)
+            logger.error(f"🚨 Error reading Parquet file for {symbol} from {parquet_filename}: {e}. Falling back to CSV.", exc_info=True)
+            existing_data = pd.DataFrame() # Clear data frame
+
+
+    # 2. If Parquet failed or doesn't exist/was unusable, fall back to CSV (legacy format)
+    # Only attempt if Parquet wasn't usable (existing_data is empty) AND CSV exists
+    if existing_data.empty and csv_file_exists:
+        data_read_attempted = True # Mark that we are attempting CSV
+        logger.info("Attempting to read existing data for %s from CSV: %s", symbol, csv_filename)
+        try:
+            existing_data = _read_csv_typed(csv_filename)
+            logger.info("Read %d rows from %s.", len(existing_data), csv_filename)
+
+            # --- IMPORTANT ---
+            # Ensure **naive** datetime64[ns]. The pyarrow reader already
+            # delivers this; ensure_naive_dt only re-parses on the pandas
+            # fallback (object/string column) or a tz-aware oddity.
+            if "DateTime" in existing_data.columns:
+                existing_data["DateTime"] = ensure_naive_dt(existing_data["DateTime"])
+
+
+            elif "Date" in existing_data.columns and "Time" in existing_data.columns:
+                # Support old format and reconstruct DateTime to **naive**
+                existing_data["DateTime"] = pd.to_datetime(existing_data["Date"] + " " + existing_data["Time"], errors='coerce')
+                existing_data.drop(columns=["Date", "Time"], errors='ignore', inplace=True)
+            else:
+                logger.warning(f"Existing CSV for {symbol} in {FOLDER_NAME} does not have 'DateTime' or 'Date'/'Time' columns. Cannot use this file.")
+                existing_data = pd.DataFrame() # Cannot use CSV
+
+            # Check if DateTime column exists and is not all null AND is the correct naive dtype
+            if "DateTime" in existing_data.columns and pd.api.types.is_datetime64_ns_dtype(existing_data["DateTime"]) and not existing_data["DateTime"].isnull().all():
+                 # CSV read successfully and has valid naive DateTime
+                 # Now check for essential OHLCV columns
+                 ohlcv_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
+                 if all(col in existing_data.columns for col in ohlcv_cols):
+                      pass # CSV is good, proceed to basic cleaning below
+                 else:
+                      missing_ohlcv = [col for col in ohlcv_cols if col not in existing_data.columns]
+                      logger.warning(f"CSV file for {symbol} has DateTime but missing essential OHLCV columns: {missing_ohlcv}.")
+                      existing_data = pd.DataFrame() # Treat as unusable CSV
+
+            else:
+                 # If DateTime column is missing, all null, or wrong dtype after CSV processing
+                 if "DateTime" in existing_data.columns:
+                     logger.warning(f"CSV file for {symbol} has unusable DateTime column (all null or wrong dtype: {existing_data['DateTime'].dtype}) after parsing.")
+                 else:
+                     logger.warning(f"CSV file for {symbol} has no DateTime column after parsing.")
+                 existing_data = pd.DataFrame() # Treat as failed read if DateTime is bad
+
+
+        except Exception as e:
+            logger.error(f"🚨 Error reading CSV file for {symbol} from {csv_filename}: {e}. Treating as no existing data.", exc_info=True)
             existing_data = pd.DataFrame() # Clear data frame
 
 
@@ -154,15 +241,13 @@ def read_existing_data(symbol: str) -> pd.DataFrame:
     if existing_data.empty:
         # Only log "No usable file found" if we actually attempted to read at least one file
         if data_read_attempted:
-             logger.info(f"No usable existing data file found (CSV or Parquet with naive datetime and OHLCV) for {symbol}.")
+             logger.info(f"No usable existing data file found (Parquet or CSV with naive datetime and OHLCV) for {symbol}.")
         # If data_read_attempted is False, it means neither file existed, which will be logged later when fetching from start_date
         return pd.DataFrame() # Return empty if neither file worked or data became empty
 
     # Apply minimal necessary cleaning after reading: Drop rows with NaT DateTime
     # This should have been handled in the parsing steps above, but adding a final check for safety
-    if not pd.api.types.is_datetime64_ns_dtype(existing_data["DateTime"]):
-         logger.warning(f"DateTime column for {symbol} is not naive datetime64[ns] after reading, attempting one last conversion before dropping NaT: {existing_data['DateTime'].dtype}")
-         existing_data["DateTime"] = pd.to_datetime(existing_data["DateTime"], errors='coerce').dt.tz_convert(None)
+    existing_data["DateTime"] = ensure_naive_dt(existing_data["DateTime"])
 
 
     initial_rows = len(existing_data)
@@ -176,9 +261,15 @@ def read_existing_data(symbol: str) -> pd.DataFrame:
         ohlcv_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
         # Check columns exist before cleaning
         if all(col in existing_data.columns for col in ohlcv_cols):
-             existing_data = existing_data.ffill().dropna(subset=ohlcv_cols) # ffill and drop NaNs in OHLCV
-             if (existing_data['Volume'] < 0).any():
-                  existing_data['Volume'] = existing_data['Volume'].abs() # Make volume non-negative
+             # One mask + slice drops incomplete rows. The old ffill().dropna()
+             # materialized a forward-filled copy of every column only to
+             # discard those same rows again via the subset dropna.
+             mask = existing_data[ohlcv_cols].notna().all(axis=1)
+             if not mask.all():
+                  existing_data = existing_data.loc[mask]
+             # Unconditional vectorized abs; cheaper than scanning with
+             # (Volume < 0).any() first and abs()-ing in a second pass.
+             existing_data['Volume'] = np.abs(existing_data['Volume'].to_numpy())
         else:
              # This case should be caught earlier if essential columns are missing, but defensive
              logger.warning(f"Missing OHLCV columns in existing data for {symbol} after NaT drop. Skipping basic OHLCV cleaning.")
@@ -199,15 +290,110 @@ def read_existing_data(symbol: str) -> pd.DataFrame:
         logger.error(f"Existing data for {symbol} is missing essential columns or DateTime is wrong dtype after final checks: {missing}. Cannot use this data.")
         return pd.DataFrame() # Return empty if essential columns are missing or DateTime dtype is wrong
 
-    # Select and reorder columns for consistency if needed
-    cols_to_return = [col for col in required_output_cols + [col for col in existing_data.columns if col not in required_output_cols] if col in existing_data.columns]
-    return existing_data[cols_to_return]
+    # One-shot migration: data that had to come from a legacy CSV is written
+    # straight back as Parquet so every later run takes the typed fast path
+    # (and the footer-statistics probe) instead of re-parsing text.
+    if not parquet_file_exists and _HAS_PYARROW and not existing_data.empty:
+        try:
+            existing_data.to_parquet(parquet_filename, index=False, compression='zstd')
+            logger.info("Migrated legacy CSV data for %s to %s.", symbol, parquet_filename)
+        except Exception as e:
+            logger.warning(f"Could not migrate legacy CSV data for {symbol} to Parquet: {e}. Continuing with in-memory data.")
+
+    # Select and reorder columns for consistency, but only pay for the
+    # reindex (a block copy) when the order actually differs.
+    current_cols = list(existing_data.columns)
+    required_set = set(required_output_cols)
+    extras = [col for col in current_cols if col not in required_set]
+    desired_cols = [col for col in required_output_cols if col in existing_data.columns] + extras
+    if current_cols == desired_cols:
+        return existing_data
+    return existing_data.reindex(columns=desired_cols, copy=False)
 
 
-def save_data(df: pd.DataFrame, symbol: str):
+def _append_parquet_row_groups(parquet_filename: str, new_rows: pd.DataFrame, symbol: str,
+                               pre_cleaned: bool = False) -> bool:
+    """
+    Appends only the newly fetched rows to an existing Parquet file as a new
+    row group, carrying the existing row groups over unchanged, so write cost
+    scales with the new rows rather than the whole history.
+    Writes to a temp file and atomically renames it into place so readers
+    never observe a partial file.
+    Returns True on success; callers fall back to a full rewrite on False.
     """
-    Applies final cleaning, sorts, removes duplicates, and saves data to
-    CSV and Parquet files for a given symbol.
+    if not _HAS_PYARROW:
+        logger.warning("PyArrow not installed. Cannot do incremental Parquet append.")
+        return False
+
+    try:
+        # Clean only the new rows; dedup/sort across the old/new boundary is
+        # deferred to the next full rewrite (taken whenever this path fails).
+        # clean_ohlcv takes ownership; new_rows isn't reused by any caller.
+        # Callers that already cleaned per chunk set pre_cleaned to skip the
+        # redundant second pass.
+        new_clean = new_rows if pre_cleaned else clean_ohlcv(new_rows)
+        if new_clean.empty:
+            logger.info(f"No usable new rows to append for {symbol} after cleaning.")
+            return True # Nothing to write; existing file is already current
+        new_clean = new_clean.sort_values("DateTime").reset_index(drop=True)
+
+        pf = pq.ParquetFile(parquet_filename)
+        schema = pf.schema_arrow
+        # Building the table against the existing schema keeps column order
+        # and types stable; incompatible new rows raise and trigger a full rewrite.
+        new_table = pa.Table.from_pandas(new_clean, schema=schema, preserve_index=False)
+
+        tmp_path = parquet_filename + '.tmp'
+        writer = pq.ParquetWriter(tmp_path, schema, compression='zstd')
+        try:
+            for i in range(pf.num_row_groups):
+                writer.write_table(pf.read_row_group(i))
+            writer.write_table(new_table, row_group_size=50_000)
+        finally:
+            writer.close()
+        os.replace(tmp_path, parquet_filename)
+        logger.info(f"💾 Appended {len(new_clean)} new rows to {parquet_filename} as a new row group.")
+        return True
+    except Exception as e:
+        logger.warning(f"Incremental Parquet append for {symbol} failed: {e}.")
+        return False
+
+
+def _combine_frames(frames: list) -> pd.DataFrame:
+    """
+    Combines same-shaped chunk frames column-wise with numpy.
+
+    pd.concat pays BlockManager alignment and consolidation overhead per
+    input frame; since every chunk here has the identical column layout,
+    a single np.concatenate per column (which preallocates the output and
+    copies each chunk in once) builds the same result with no alignment
+    work, and the DataFrame is assembled from those arrays without copying.
+    Falls back to pd.concat for mismatched layouts or exotic dtypes.
+    """
+    if len(frames) == 1:
+        return frames[0]
+    cols = list(frames[0].columns)
+    if any(list(f.columns) != cols for f in frames[1:]):
+        return pd.concat(frames, ignore_index=True, copy=False)
+    try:
+        # np.concatenate promotes mixed dtypes (e.g. uint32 + int64 volume
+        # columns) the same way pd.concat would.
+        data = {col: np.concatenate([f[col].to_numpy() for f in frames]) for col in cols}
+    except (ValueError, TypeError):
+        return pd.concat(frames, ignore_index=True, copy=False)
+    return pd.DataFrame(data, copy=False)
+
+
+def save_data(df: pd.DataFrame, symbol: str, *, export_csv: bool = CSV_EXPORT_ENABLED,
+              new_rows_only: pd.DataFrame = None, assume_clean: bool = False):
+    """
+    Applies final cleaning, sorts, removes duplicates, and saves data to a
+    Parquet file for a given symbol (plus a CSV copy if export_csv is True).
+    If new_rows_only is provided and a Parquet file already exists, only those
+    rows are appended as a new row group instead of rewriting the full history.
+    With assume_clean=True the full clean_ohlcv pass is skipped: callers that
+    built df from a prior save's on-disk output plus per-chunk-cleaned fetches
+    only need the cheap sort/dedupe across the old/new boundary below.
     Uses the constructed FOLDER_NAME based on interval.
     Assumes input df has a **naive** 'DateTime' column.
     Saves data with the **naive** 'DateTime' column.
@@ -218,20 +404,36 @@ def save_data(df: pd.DataFrame, symbol: str):
 
     logger.info(f"Initiating save process for {symbol} with {len(df)} rows.")
 
+    global _FOLDER_READY
     try:
-        os.makedirs(FOLDER_NAME, exist_ok=True)
-        csv_filename = os.path.join(FOLDER_NAME, f"{symbol}{CSV_EXTENSION}")
-        parquet_filename = os.path.join(FOLDER_NAME, f"{symbol}{PARQUET_EXTENSION}")
+        if not _FOLDER_READY:
+            os.makedirs(FOLDER_NAME, exist_ok=True)
+            _FOLDER_READY = True
+        csv_filename, parquet_filename = _paths(symbol)
     except OSError as e:
         logger.error(f"🚨 Could not create data directory {FOLDER_NAME}: {e}. Cannot save data for {symbol}.", exc_info=True)
         return
 
+    # ------------------------------------------------------------------
+    # Incremental fast path: when the caller identifies exactly which rows
+    # are new and a Parquet file already holds the history, append them as a
+    # fresh row group instead of re-encoding every unchanged row. The CSV
+    # export has no append equivalent, so it forces the full-rewrite path.
+    # ------------------------------------------------------------------
+    if (new_rows_only is not None and not new_rows_only.empty
+            and not export_csv and os.path.exists(parquet_filename)):
+        if _append_parquet_row_groups(parquet_filename, new_rows_only, symbol,
+                                      pre_cleaned=assume_clean):
+            logger.info(f"Finished incremental Parquet append for {symbol}.")
+            return
+        logger.warning(f"Incremental append unavailable for {symbol}; falling back to full rewrite.")
+
     # Ensure 'DateTime' column is present and is **naive** datetime64[ns] before final cleaning
     if 'DateTime' not in df.columns or not pd.api.types.is_datetime64_ns_dtype(df['DateTime']):
          # Attempt to convert if present but wrong dtype
          if 'DateTime' in df.columns:
               logger.warning(f"DateTime column for {symbol} not naive datetime64[ns] before save processing: {df['DateTime'].dtype}. Attempting conversion.")
-              df['DateTime'] = pd.to_datetime(df['DateTime'], errors='coerce').dt.tz_convert(None)
+              df['DateTime'] = ensure_naive_dt(df['DateTime'])
          else:
              logger.error(f"🚨 Cannot save data for {symbol}: 'DateTime' column is missing.")
              return # Exit save function if DateTime is fundamentally unusable
@@ -248,12 +450,21 @@ def save_data(df: pd.DataFrame, symbol: str):
     # At this point, df['DateTime'] should be pd.Series with dtype datetime64[ns] (or dataframe is empty)
 
 
-    logger.debug(f"Applying final cleaning for {symbol}...")
-    # Apply final cleaning (handles NaNs, duplicates, OHLC validation etc.)
-    # clean_ohlcv expects DateTime as a column and returns it as a column, preserving naivety.
-    # Pass a copy to avoid modifying the input df if clean_ohlcv does in place ops (though it copies internally)
-    data_to_save = clean_ohlcv(df.copy())
-    logger.debug(f"Final cleaning resulted in {len(data_to_save)} rows for {symbol}.")
+    if assume_clean:
+        # Every row already went through clean_ohlcv — the on-disk history at
+        # its previous save, the fresh chunks inside the fetch loop — so a
+        # second ffill/validation pass over the full (potentially
+        # millions-of-rows) frame is pure overhead. The O(n) sort/dedupe
+        # below still runs to reconcile the old/new boundary.
+        data_to_save = df
+    else:
+        logger.debug("Applying final cleaning for %s...", symbol)
+        # Apply final cleaning (handles NaNs, duplicates, OHLC validation etc.)
+        # clean_ohlcv expects DateTime as a column and returns it as a column, preserving naivety.
+        # No defensive copy needed: clean_ohlcv copies internally and CoW (above)
+        # protects the caller's frame from incidental writes.
+        data_to_save = clean_ohlcv(df)
+        logger.debug("Final cleaning resulted in %d rows for %s.", len(data_to_save), symbol)
 
     # Ensure DateTime column is still present and naive after clean_ohlcv
     if 'DateTime' not in data_to_save.columns or not pd.api.types.is_datetime64_ns_dtype(data_to_save['DateTime']):
@@ -261,31 +472,29 @@ def save_data(df: pd.DataFrame, symbol: str):
          return # Exit save function
 
 
-    # Sort by DateTime before saving
-    if 'DateTime' in data_to_save.columns and not data_to_save['DateTime'].isnull().all(): # Check if not all values are NaT for sorting
-        logger.debug(f"Sorting data by DateTime for {symbol}...")
-        # Sort works correctly on naive DateTime
-        data_to_save = data_to_save.sort_values("DateTime").reset_index(drop=True)
-        logger.debug(f"Data sorted for {symbol}.")
-    else:
-         logger.warning("Cannot sort by DateTime as column is all null after final cleaning.")
-         if data_to_save.empty:
-              logger.warning("Cleaned data is empty, nothing to save.")
-              return # Exit if empty
-         # Continue attempting to save without sorting if DateTime is critically missing or all NaT
-
-
-    # Drop duplicates based on DateTime after sorting - keep the last one
-    if 'DateTime' in data_to_save.columns and not data_to_save['DateTime'].isnull().all(): # Check if not all values are NaT for dropping duplicates
+    # Sort and deduplicate by DateTime in a single pass: np.unique on the
+    # int64 view of the naive datetime64[ns] column both orders the
+    # timestamps and identifies the unique ones, replacing a full pandas
+    # sort followed by a hash-based drop_duplicates. Running it over the
+    # reversed array makes np.unique's "first occurrence" index pick the
+    # *last* row for each duplicated timestamp (matching keep='last').
+    if 'DateTime' in data_to_save.columns and not data_to_save['DateTime'].isnull().all(): # Check if not all values are NaT
         initial_rows = len(data_to_save)
-        logger.debug(f"Dropping duplicates for {symbol} (initial count: {initial_rows})...")
-        data_to_save.drop_duplicates(subset=["DateTime"], keep="last", inplace=True)
+        logger.debug("Sorting and dropping duplicates for %s (initial count: %d)...", symbol, initial_rows)
+        ts = data_to_save['DateTime'].to_numpy().view('i8')
+        _, rev_idx = np.unique(ts[::-1], return_index=True)
+        keep_idx = (len(ts) - 1) - rev_idx # Positions of kept rows, already in ascending timestamp order
+        data_to_save = data_to_save.iloc[keep_idx].reset_index(drop=True)
         if len(data_to_save) < initial_rows:
              logger.info(f"Dropped {initial_rows - len(data_to_save)} duplicate DateTime entries before saving.")
         else:
-             logger.debug(f"No DateTime duplicates found for {symbol}.")
+             logger.debug("No DateTime duplicates found for %s.", symbol)
     else:
-         logger.warning("Cannot drop duplicates by DateTime as column is all null.")
+         logger.warning("Cannot sort/deduplicate by DateTime as column is all null after final cleaning.")
+         if data_to_save.empty:
+              logger.warning("Cleaned data is empty, nothing to save.")
+              return # Exit if empty
+         # Continue attempting to save unsorted if DateTime is critically missing or all NaT
 
 
     # Select and reorder columns for the final output file
@@ -300,109 +509,169 @@ def save_data(df: pd.DataFrame, symbol: str):
          logger.warning(f"Final data for {symbol} is empty or missing/invalid essential columns ('DateTime'). Skipping save.")
          return # Exit save function
 
-    data_to_save = data_to_save[cols_to_save]
-
-
-    # Save the cleaned and formatted data
+    if list(data_to_save.columns) != cols_to_save:
+        data_to_save = data_to_save[cols_to_save]
+
+    # Downcast for storage: prices fit comfortably in float32 (tick sizes are
+    # far coarser than float32 precision) and volume fits uint32 unless a bar
+    # ever exceeds 2**31. Halves the decoded column-chunk size on disk and
+    # the RAM needed to reload the file later. clean_ohlcv already downcasts,
+    # so the dtype checks make this a no-op on the normal path; it only runs
+    # for assume_clean callers feeding legacy full-width frames.
+    for col in ('Open', 'High', 'Low', 'Close'):
+        if col in data_to_save.columns and data_to_save[col].dtype != np.float32:
+            data_to_save[col] = data_to_save[col].astype('float32')
+    if 'Volume' in data_to_save.columns and data_to_save['Volume'].dtype.kind == 'f':
+        vol_max = data_to_save['Volume'].max()
+        vol_dtype = 'int64' if pd.notna(vol_max) and vol_max >= 2**31 else 'uint32'
+        data_to_save['Volume'] = data_to_save['Volume'].astype(vol_dtype)
+
+
+    # Save the cleaned and formatted data. Parquet is the primary format:
+    # typed columns round-trip without re-parsing, and compressed columnar
+    # storage is several times smaller and faster than CSV text.
     if not data_to_save.empty: # Final check before saving
         logger.info(f"Saving final data ({len(data_to_save)} rows) for {symbol} to disk...")
-        try:
-            logger.info(f"Saving CSV to {csv_filename}...")
-            # Use date_format argument to ensure naive datetime is saved in a standard format
-            data_to_save.to_csv(csv_filename, index=False, date_format='%Y-%m-%d %H:%M:%S')
-            logger.info(f"💾 Data saved successfully to {csv_filename}")
-        except Exception as e:
-            logger.error(f"🚨 Error saving CSV for {symbol} to {csv_filename}: {e}", exc_info=True)
-
-        try:
-            # Check if pyarrow is installed for parquet
+        if _HAS_PYARROW:
             try:
-                import pyarrow
-            except ImportError:
-                logger.warning("PyArrow not installed. Skipping Parquet save. Install with 'pip install pyarrow'.")
-                pyarrow = None # Set to None to prevent saving
-
-            if pyarrow:
                 logger.info(f"Saving Parquet to {parquet_filename}...")
-                # Parquet saves datetime64[ns] correctly as naive
-                data_to_save.to_parquet(parquet_filename, index=False)
+                # Parquet saves datetime64[ns] correctly as naive. Bounded row
+                # groups keep later column-pruned/range reads efficient; zstd
+                # decompresses ~2x faster than snappy at a comparable ratio.
+                tbl = pa.Table.from_pandas(data_to_save, preserve_index=False)
+                write_kwargs = {}
+                dt_field_idx = tbl.schema.get_field_index('DateTime')
+                if hasattr(pq, 'SortingColumn') and dt_field_idx >= 0:
+                    # The data is sorted by DateTime at this point; declaring
+                    # that in row-group metadata lets range readers (Arrow
+                    # datasets, DuckDB, polars) skip whole row groups via the
+                    # footer min/max instead of scanning and re-sorting.
+                    write_kwargs['sorting_columns'] = [pq.SortingColumn(dt_field_idx)]
+                pq.write_table(
+                    tbl, parquet_filename,
+                    compression='zstd', use_dictionary=True, row_group_size=50_000,
+                    **write_kwargs
+                )
                 logger.info(f"💾 Data saved successfully to {parquet_filename}")
-        except Exception as e:
-             logger.error(f"🚨 Error saving Parquet for {symbol} to {parquet_filename}: {e}", exc_info=True)
+            except Exception as e:
+                 logger.error(f"🚨 Error saving Parquet for {symbol} to {parquet_filename}: {e}", exc_info=True)
+        else:
+            logger.warning("PyArrow not installed. Skipping Parquet save. Install with 'pip install pyarrow'.")
+
+        # CSV is an optional export only; writing it doubles the save cost and
+        # forces a full text re-parse on the next read.
+        if export_csv:
+            try:
+                logger.info(f"Saving CSV to {csv_filename}...")
+                # Use date_format argument to ensure naive datetime is saved in a standard format
+                data_to_save.to_csv(csv_filename, index=False, date_format='%Y-%m-%d %H:%M:%S')
+                logger.info(f"💾 Data saved successfully to {csv_filename}")
+            except Exception as e:
+                logger.error(f"🚨 Error saving CSV for {symbol} to {csv_filename}: {e}", exc_info=True)
     else:
         logger.warning(f"Final data for {symbol} is empty after processing. Skipping save.")
 
 
 def update_symbol_data(symbol: str, token: str, smart_api_client: SmartApiClient):
     """
-    Reads existing data (preferring CSV, reads naive), determines the start date for new data,
+    Reads existing data (preferring Parquet, reads naive), determines the start date for new data,
     fetches new data (naive), concatenates (result is naive), cleans, and saves ONLY if new data was fetched.
     Assumes all naive datetimes represent IST.
     """
     # current_date is naive
     current_date = datetime.now()
 
-    # Parse the start date from config as naive
+    # Parse the start date from config as naive. fromisoformat has a dedicated
+    # C fast path; strptime runs a full format state machine per call and is
+    # kept only as a fallback for unexpected formats.
     try:
-        start_date_config = datetime.strptime(START_DATE, "%Y-%m-%d") # start_date_config is naive
-    except ValueError as e:
-        logger.critical(f"Invalid START_DATE format in config: {START_DATE}. Expected YYYY-MM-DD. Error: {e}. Exiting.")
-        return # Cannot proceed with invalid start date
+        start_date_config = datetime.fromisoformat(START_DATE) # start_date_config is naive
+    except ValueError:
+        try:
+            start_date_config = datetime.strptime(START_DATE, "%Y-%m-%d")
+        except ValueError as e:
+            logger.critical(f"Invalid START_DATE format in config: {START_DATE}. Expected YYYY-MM-DD. Error: {e}. Exiting.")
+            return # Cannot proceed with invalid start date
 
 
-    logger.info(f"\n--- Processing {symbol} (Token: {token}, Interval: {smart_api_client.interval}) ---")
+    # Tag with the worker thread name so interleaved logs from parallel
+    # symbol processing remain attributable.
+    logger.info(f"\n--- Processing {symbol} (Token: {token}, Interval: {smart_api_client.interval}) [{threading.current_thread().name}] ---")
     logger.info(f"Data will be stored in folder: {FOLDER_NAME}")
     # Log the current date being used for comparisons
-    logger.info(f"Current system date/time (assumed IST): {current_date.strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info("Current system date/time (assumed IST): %s", current_date)
 
 
+    # ----------------------------
+    # Footer-only freshness probe: the Parquet footer statistics give the
+    # last stored timestamp for a few KB of I/O. If that already reaches the
+    # latest fetchable bar, skip decoding the full history entirely.
+    # ----------------------------
+    fetch_end_date_limit = current_date - timedelta(minutes=1) # latest time to fetch up to (naive)
+    _, parquet_filename = _paths(symbol)
+    last_peek = _peek_last_datetime(parquet_filename)
+    if last_peek is not None and last_peek + timedelta(minutes=1) >= fetch_end_date_limit:
+        logger.info("Data for %s is already up-to-date per Parquet footer (last record %s, latest fetchable: %s). Skipping read and fetch.", symbol, last_peek, fetch_end_date_limit)
+        return
+
     # ----------------------------
     # Read existing data (DateTime as naive datetime64[ns] column)
     # ----------------------------
-    existing_data_naive = read_existing_data(symbol)
+    # When the footer already supplied the last stored timestamp and the save
+    # will be an append-only row group (no CSV export to rewrite), the full
+    # history never needs to exist in memory at all: skip decoding it and let
+    # the append path write just the new rows. It is loaded lazily below only
+    # if the incremental append fails and a full rewrite becomes necessary.
+    defer_history_read = last_peek is not None and not CSV_EXPORT_ENABLED
+    if defer_history_read:
+        logger.info("Deferring full history read for %s: footer supplies the last timestamp and the save path is append-only.", symbol)
+        existing_data_naive = pd.DataFrame()
+    else:
+        existing_data_naive = read_existing_data(symbol)
 
     data_changed = False # Flag to track if new data was added
 
-    if not existing_data_naive.empty:
-        # Find the latest date in the existing data's naive DateTime column
-        # read_existing_data should ensure DateTime is naive datetime64[ns] and not all null
-        # Drop NaT before finding max for safety, although read_existing_data should handle this
-        existing_data_naive.dropna(subset=["DateTime"], inplace=True)
+    if defer_history_read:
+        last_date = last_peek # naive Timestamp straight from the Parquet footer
+        logger.info("Existing Parquet data found. Last record per footer (assumed IST): %s.", last_date)
+        new_start_date = last_date + timedelta(minutes=1) # new_start_date is naive Timestamp
+        all_data = pd.DataFrame() # History stays on disk; append-only save below
 
-        if not existing_data_naive.empty: # Check again after dropping NaT
-            last_date = existing_data_naive["DateTime"].max() # last_date is naive Timestamp
+    elif not existing_data_naive.empty:
+        # read_existing_data guarantees (postcondition) a naive datetime64[ns]
+        # DateTime column with NaT rows already dropped, so no defensive
+        # dropna scan is needed before taking the max. The assert documents
+        # the contract and is stripped under -O.
+        if __debug__:
+            assert existing_data_naive["DateTime"].notna().all(), \
+                "read_existing_data returned NaT DateTimes"
 
-            logger.info(f"Existing data found. Last record (assumed IST): {last_date.strftime('%Y-%m-%d %H:%M:%S')}.")
+        last_date = existing_data_naive["DateTime"].max() # last_date is naive Timestamp
 
-            # Determine the start date for fetching *new* data (1 minute after the last timestamp)
-            new_start_date = last_date + timedelta(minutes=1) # new_start_date is naive Timestamp
+        logger.info("Existing data found. Last record (assumed IST): %s.", last_date)
 
-            # Use existing data (naive) as the base for concatenation
-            all_data = existing_data_naive.copy()
-        else:
-             # If existing_data_naive became empty after parsing/dropping NaT or checks in read_existing_data
-             logger.warning(f"Existing data for {symbol} became empty or unusable after initial processing. Treating as no existing data.")
-             all_data = pd.DataFrame()
-             new_start_date = start_date_config # Use config start date (naive Timestamp)
-             data_changed = True # Mark as changed if starting fresh
+        # Determine the start date for fetching *new* data (1 minute after the last timestamp)
+        new_start_date = last_date + timedelta(minutes=1) # new_start_date is naive Timestamp
+
+        # Use existing data (naive) as the base for concatenation
+        all_data = existing_data_naive.copy()
 
     else:
         # No usable existing data found initially (empty or failed read_existing_data)
-        logger.info(f"No usable existing data found for {symbol}. Fetching from config start date (assumed IST): {start_date_config.strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info("No usable existing data found for %s. Fetching from config start date (assumed IST): %s", symbol, start_date_config)
         all_data = pd.DataFrame() # Start with empty DataFrame
         new_start_date = start_date_config # Use config start date (naive Timestamp)
         data_changed = True # Mark as changed if starting fresh
 
 
-    # Determine the latest time to fetch data up to. (current time - buffer, naive)
-    fetch_end_date_limit = current_date - timedelta(minutes=1)
+    # Latest time to fetch data up to (computed above for the footer probe)
     fetch_end_date = fetch_end_date_limit # fetch_end_date is naive Timestamp
 
 
     # Check if fetching is needed at all (compare naive Timestamps)
     # This comparison should now work correctly as both are naive.
     if new_start_date >= fetch_end_date:
-        logger.info(f"Data for {symbol} is already up-to-date as of {new_start_date.strftime('%Y-%m-%d %H:%M:%S')} (latest fetchable: {fetch_end_date.strftime('%Y-%m-%d %H:%M:%S')}). Skipping new data fetch.")
+        logger.info("Data for %s is already up-to-date as of %s (latest fetchable: %s). Skipping new data fetch.", symbol, new_start_date, fetch_end_date)
         # If data_changed is True, it means we started fresh (no existing file or file was unusable), but found no data to fetch.
         # If data_changed is False, it means we read an existing file and it's up-to-date.
         if data_changed:
@@ -424,7 +693,7 @@ def update_symbol_data(symbol: str, token: str, smart_api_client: SmartApiClient
 
     # Add a check to avoid fetching if the start date is after the end date (e.g., due to current time buffer)
     if fetch_start_dt > fetch_end_dt:
-         logger.warning(f"Calculated fetch start date {fetch_start_dt.strftime('%Y-%m-%d %H:%M:%S')} is after fetch end date {fetch_end_dt.strftime('%Y-%m-%d %H:%M:%S')}. Skipping new data fetch entirely.")
+         logger.warning("Calculated fetch start date %s is after fetch end date %s. Skipping new data fetch entirely.", fetch_start_dt, fetch_end_dt)
          # If data_changed is True (started fresh), log warning about no data
          if data_changed and all_data.empty:
                logger.warning(f"No usable existing data and no new data found in the fetch range for {symbol}. Nothing to save.")
@@ -432,86 +701,135 @@ def update_symbol_data(symbol: str, token: str, smart_api_client: SmartApiClient
          return
 
 
-    logger.info(f"Starting new data fetch in chunks from {fetch_start_dt.strftime('%Y-%m-%d %H:%M:%S')} up to {fetch_end_dt.strftime('%Y-%m-%d %H:%M:%S')} (assumed IST)")
+    logger.info("Starting new data fetch in chunks from %s up to %s (assumed IST)", fetch_start_dt, fetch_end_dt)
 
 
     # ----------------------------
     # Fetch new data in monthly chunks
     # ----------------------------
-    chunk_timedelta = timedelta(days=30) # Use days for chunk size base
-    current_chunk_start_dt = fetch_start_dt # Start fetching from this naive datetime
-
-    # Loop while the *start* of the current chunk is within or equal to the fetch end datetime
-    while current_chunk_start_dt <= fetch_end_dt:
-        # Determine chunk end date/time: max chunk_timedelta from start, or up to fetch_end_dt
-        chunk_end_dt = min(current_chunk_start_dt + chunk_timedelta, fetch_end_dt)
-
-        # API expects HH:MM format strings - get_candle_data handles this formatting internally
-        # Pass the precise naive datetime objects for the range
-        logger.info(f"Requesting data chunk from: {current_chunk_start_dt.strftime('%Y-%m-%d %H:%M:%S')} to {chunk_end_dt.strftime('%Y-%m-%d %H:%M:%S')}")
-
-        # Pass naive datetimes to the fetch function
-        df_new = smart_api_client.get_candle_data(token, current_chunk_start_dt, chunk_end_dt) # df_new should have naive DateTime column
+    # iter_candle_data splits the range into ~30-day chunks and fetches them
+    # with a bounded worker pool while this loop processes results in order,
+    # overlapping network latency with cleaning/concatenation. API pacing is
+    # governed by the shared adaptive rate limiter in api_client.
+    new_frames = [] # Newly fetched chunks only, for the incremental append path in save_data
+    # Newest timestamp already stored or collected; rows at or before it are
+    # seam overlap and never make it into new_frames.
+    last_seen_dt = fetch_start_dt - timedelta(minutes=1)
+    for current_chunk_start_dt, chunk_end_dt, df_new in smart_api_client.iter_candle_data(
+            token, fetch_start_dt, fetch_end_dt):
+        logger.info("Processing data chunk from: %s to %s", current_chunk_start_dt, chunk_end_dt)
 
         if df_new.empty:
-            logger.info(f"⚠️ No new data returned by API for chunk from {current_chunk_start_dt.strftime('%Y-%m-%d %H:%M:%S')} to {chunk_end_dt.strftime('%Y-%m-%d %H:%M:%S')}.")
+            logger.info("⚠️ No new data returned by API for chunk from %s to %s.", current_chunk_start_dt, chunk_end_dt)
         else:
             # df_new should already have naive DateTime column from get_candle_data.
             # Just drop NaTs that may have occurred during conversion in get_candle_data.
             # Also ensure it is indeed naive datetime64[ns] as a final check here
             if not pd.api.types.is_datetime64_ns_dtype(df_new["DateTime"]):
                  logger.warning(f"New data DateTime column for {symbol} is not naive datetime64[ns] after fetch: {df_new['DateTime'].dtype}. Attempting correction.")
-                 # Attempt to make it naive if possible, coercing errors
-                 df_new["DateTime"] = pd.to_datetime(df_new["DateTime"], errors='coerce').dt.tz_convert(None)
+                 df_new["DateTime"] = ensure_naive_dt(df_new["DateTime"])
 
-            initial_rows = len(df_new)
-            df_new.dropna(subset=["DateTime"], inplace=True)
-            if len(df_new) < initial_rows:
-                 logger.warning(f"Dropped {initial_rows - len(df_new)} rows with NaT DateTime in new data from chunk.")
+            # get_candle_data already coerces bad timestamps and drops NaT
+            # rows before returning, so no per-chunk dropna pass is needed.
+            if __debug__:
+                assert df_new["DateTime"].notna().all(), \
+                    "get_candle_data returned NaT DateTimes"
 
             # Only keep data within the requested chunk range (inclusive start, inclusive end)
             # Filter using naive datetimes. This comparison should now work.
             if not df_new.empty: # Check if any data remains after dropping NaT
                 initial_rows = len(df_new)
-                df_new = df_new[
-                    (df_new["DateTime"] >= current_chunk_start_dt) &
-                    (df_new["DateTime"] <= chunk_end_dt)
-                ].copy() # Use copy() after filtering to avoid SettingWithCopyWarning
+                if df_new["DateTime"].is_monotonic_increasing:
+                    # API chunks arrive sorted, so the in-range rows form one
+                    # contiguous block: find its bounds with two O(log n)
+                    # binary searches and slice, instead of building boolean
+                    # masks over the whole chunk.
+                    values = df_new["DateTime"].values
+                    lo = np.searchsorted(values, np.datetime64(current_chunk_start_dt), side='left')
+                    hi = np.searchsorted(values, np.datetime64(chunk_end_dt), side='right')
+                    df_new = df_new.iloc[lo:hi]
+                else:
+                    df_new = df_new[
+                        (df_new["DateTime"] >= current_chunk_start_dt) &
+                        (df_new["DateTime"] <= chunk_end_dt)
+                    ].copy() # Use copy() after filtering to avoid SettingWithCopyWarning
                 if len(df_new) < initial_rows:
-                     logger.warning(f"Dropped {initial_rows - len(df_new)} rows outside the requested chunk range [{current_chunk_start_dt.strftime('%Y-%m-%d %H:%M:%S')} to {chunk_end_dt.strftime('%Y-%m-%d %H:%M:%S')}].")
+                     logger.warning("Dropped %d rows outside the requested chunk range [%s to %s].", initial_rows - len(df_new), current_chunk_start_dt, chunk_end_dt)
+
+            # Drop rows at or before the newest row already stored/collected.
+            # Chunk ranges are disjoint, so the common case is a single scalar
+            # comparison on the first row; only a genuine seam overlap pays
+            # for the slice. Overlap removed here never reaches the combined
+            # frame, so the final dedupe has nothing to do at the seam.
+            if not df_new.empty:
+                last_seen64 = np.datetime64(last_seen_dt)
+                values = df_new["DateTime"].values
+                if values[0] <= last_seen64:
+                    overlap_rows = len(df_new)
+                    if df_new["DateTime"].is_monotonic_increasing:
+                        df_new = df_new.iloc[np.searchsorted(values, last_seen64, side='right'):]
+                    else:
+                        df_new = df_new[values > last_seen64]
+                    logger.info("Dropped %d rows overlapping already-collected data at the chunk seam.", overlap_rows - len(df_new))
 
+            if not df_new.empty:
+                # Clean each chunk here (cleaned-once invariant): the on-disk
+                # history is the output of a previous clean, so once fresh
+                # chunks are cleaned too, save_data can skip its full
+                # clean_ohlcv pass over the combined frame (assume_clean).
+                # clean_ohlcv takes ownership; df_new isn't reused below.
+                df_new = clean_ohlcv(df_new)
 
             if not df_new.empty:
-                # Concatenate existing data (naive) with new data (naive).
-                # The resulting DateTime column remains naive.
-                initial_total_rows = len(all_data)
-                all_data = pd.concat([all_data, df_new], ignore_index=True)
+                # Defer concatenation: collect the chunk and combine once
+                # after the loop. Concatenating per chunk copies the whole
+                # accumulated frame every iteration (quadratic over chunks).
+                new_frames.append(df_new)
+                last_seen_dt = df_new["DateTime"].iat[-1] # Advance the seam guard
                 data_changed = True # Mark that new data was successfully added
-                logger.info(f"Fetched and added {len(df_new)} new rows. Total rows: {len(all_data)}")
+                logger.info("Fetched %d new rows from chunk.", len(df_new))
             else:
-                 logger.warning(f"Fetched data for chunk from {current_chunk_start_dt.strftime('%Y-%m-%d %H:%M:%S')} to {chunk_end_dt.strftime('%Y-%m-%d %H:%M:%S')} was empty after cleaning/filtering.")
+                 logger.warning("Fetched data for chunk from %s to %s was empty after cleaning/filtering.", current_chunk_start_dt, chunk_end_dt)
 
-        # Move to the start of the next chunk: 1 minute after the end of the current chunk
-        # Using chunk_end_dt + timedelta(minutes=1) ensures we request the candle starting
-        # immediately after the last candle in the previous chunk.
-        current_chunk_start_dt = chunk_end_dt + timedelta(minutes=1)
-
-        # Add a delay between requests for different chunks
-        if current_chunk_start_dt <= fetch_end_dt:
-             time.sleep(REQUEST_DELAY)
-        # Add an extra small delay *after* the last chunk if data was fetched,
-        # to avoid hitting the next symbol's API call too fast.
-        elif data_changed: # Delay only happens once after the last chunk is processed, *if* data was added
-             time.sleep(REQUEST_DELAY * 2)
 
+    # Combine existing data (naive) with all new chunks (naive) in a single
+    # pass. _combine_frames concatenates the underlying numpy columns
+    # directly, skipping pd.concat's per-frame BlockManager alignment.
+    # The resulting DateTime column remains naive.
+    if new_frames:
+        frames = ([all_data] if not all_data.empty else []) + new_frames
+        all_data = _combine_frames(frames)
+        logger.info("Combined %d new chunks (%d new rows) with existing data. Total rows: %d",
+                    len(new_frames), sum(len(f) for f in new_frames), len(all_data))
 
     # ----------------------------
     # Final Processing and Saving (Only if data_changed is True and DataFrame is not empty)
     # ----------------------------
-    if data_changed and not all_data.empty:
+    if data_changed and defer_history_read and not all_data.empty:
+        # Append-only save: the history was never loaded, so all_data holds
+        # just the cleaned new rows. Never hand this frame to a full rewrite —
+        # that would replace years of history with the new tail.
+        logger.info(f"Appending {len(all_data)} new rows for {symbol} without materializing history...")
+        if _append_parquet_row_groups(parquet_filename, all_data, symbol, pre_cleaned=True):
+            logger.info(f"Finished incremental Parquet append for {symbol}.")
+            return
+        # Append failed (schema drift, corrupt file, ...): load the history
+        # after all and take the normal combine-and-rewrite path.
+        logger.warning(f"Incremental append unavailable for {symbol}; loading full history for a rewrite.")
+        existing_data_naive = read_existing_data(symbol)
+        if not existing_data_naive.empty:
+            all_data = _combine_frames([existing_data_naive] + new_frames)
+        save_data(all_data, symbol, assume_clean=True)
+        logger.info(f"Finished processing and saving data for {symbol}.")
+    elif data_changed and not all_data.empty:
         # At this point, all_data should contain combined data with a naive DateTime column
         logger.info(f"New data fetched. Finalizing and saving combined data ({len(all_data)} rows) for {symbol}...")
-        save_data(all_data, symbol) # save_data expects and saves naive
+        # Pass the newly fetched rows separately so save_data can append just
+        # a row group when the Parquet history already exists on disk.
+        new_rows = _combine_frames(new_frames) if new_frames else None
+        # assume_clean: history came from a previous save's clean output and
+        # every new chunk was cleaned in the loop above.
+        save_data(all_data, symbol, new_rows_only=new_rows, assume_clean=True) # save_data expects and saves naive
         logger.info(f"Finished processing and saving data for {symbol}.")
     elif data_changed and all_data.empty:
          logger.warning(f"Attempted to fetch new data for {symbol} (started fresh or existing data invalid), but no usable data resulted. Nothing to save.")
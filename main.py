@@ -2,14 +2,14 @@
 import sys
 import logging
 from datetime import datetime
-import time # Import time for sleep
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Optional: If using .env file for local development, uncomment the next two lines:
 # from dotenv import load_dotenv
 # load_dotenv()
 
 # Import configuration
-from config import CLIENTID, REQUEST_DELAY # Import REQUEST_DELAY
+from config import CLIENTID, SYMBOL_WORKERS
 
 # Import modules with separated functionalities
 from logging_setup import setup_logging # Import the logging setup function
@@ -53,33 +53,35 @@ def main():
     logger.info(f"Processing data for {len(nifty50_nse_df)} Nifty 50 equities.")
 
     # ----------------------------
-    # 3. Process data for each symbol
+    # 3. Process data for each symbol (in parallel)
     # ----------------------------
+    # Symbol processing is I/O-bound: HTTP requests and pyarrow Parquet I/O
+    # both release the GIL, so a small thread pool scales near-linearly.
+    # Aggregate API pacing stays within rate limits because every candle
+    # request still passes through the shared adaptive rate limiter in
+    # api_client, replacing the old fixed per-symbol sleep.
+    symbols = [(row["name"], row["token"]) for _, row in nifty50_nse_df.iterrows()]
+    total_symbols = len(symbols)
     processed_count = 0
-    # Iterate over symbols and process each one
-    for index, row in nifty50_nse_df.iterrows():
-        try:
-            symbol = row["name"]
-            token = row["token"]
-            logger.info(f"\n--- Starting processing for {symbol} ---") # Added log before processing symbol
-
-            # Call the data manager function to handle update logic for this symbol
-            update_symbol_data(symbol, token, smart_api_client)
-
-            processed_count += 1
-            logger.info(f"--- Finished processing {symbol}. Processed {processed_count}/{len(nifty50_nse_df)} symbols overall. ---")
-
-        except Exception as e:
-            # Catch any unexpected error during the processing of a single symbol
-            # Log the error and continue with the next symbol
-            logger.error(f"🚨 An unexpected error occurred while processing symbol {row.get('name', 'N/A')} (Token: {row.get('token', 'N/A')}): {e}", exc_info=True)
-            logger.warning(f"Skipping symbol {row.get('name', 'N/A')} and proceeding to the next.")
-
-        # --- Add a delay between processing each symbol ---
-        # This helps comply with per-minute or per-hour rate limits when processing multiple items.
-        if processed_count < len(nifty50_nse_df): # Don't delay after the last symbol
-            logger.debug(f"Waiting for {REQUEST_DELAY} seconds before processing the next symbol.")
-            time.sleep(REQUEST_DELAY)
+
+    max_workers = max(1, min(SYMBOL_WORKERS, total_symbols))
+    logger.info(f"Processing {total_symbols} symbols with {max_workers} worker threads.")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(update_symbol_data, symbol, token, smart_api_client): symbol
+            for symbol, token in symbols
+        }
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                future.result()
+                processed_count += 1
+                logger.info(f"--- Finished processing {symbol}. Processed {processed_count}/{total_symbols} symbols overall. ---")
+            except Exception as e:
+                # Catch any unexpected error during the processing of a single symbol
+                # Log the error and continue with the remaining symbols
+                logger.error(f"🚨 An unexpected error occurred while processing symbol {symbol}: {e}", exc_info=True)
+                logger.warning(f"Skipping symbol {symbol} and proceeding with the rest.")
 
 
     logger.info("\n🎉 Data extraction and update process completed.")
@@ -0,0 +1,132 @@
+# rate_limiter.py
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AdaptiveTokenBucket:
+    """
+    Client-side rate limiter that adapts to observed server pressure.
+
+    Behaves like a token bucket: callers take a token via acquire() and tokens
+    refill continuously at the current rate. The rate grows gently on
+    successful responses (additive increase) and shrinks sharply whenever the
+    server reports a rate limit (multiplicative decrease), converging on the
+    server's actual capacity much like TCP congestion control. This replaces
+    static inter-request sleeps, which either over-throttle when the server
+    has headroom or under-throttle and trigger rate-limit storms.
+
+    Thread-safe; a single instance can be shared by all fetch workers.
+    """
+
+    def __init__(self, rate: float, capacity: float = None,
+                 min_rate: float = 0.2, increase: float = 0.05, decrease: float = 0.5,
+                 max_rate: float = None):
+        """
+        Args:
+            rate: Initial refill rate in tokens (requests) per second.
+            capacity: Maximum burst size. Defaults to one second's worth of tokens.
+            min_rate: Floor the rate can never shrink below (tokens/second).
+            increase: Tokens/second added to the rate per successful response.
+            decrease: Multiplicative factor applied to the rate on a rate-limit response.
+            max_rate: Ceiling the rate can never grow above (tokens/second).
+                Set this to the API's documented request limit so additive
+                increase probes up to — but never past — the published cap
+                instead of discovering it by triggering throttles. None
+                leaves the rate unbounded.
+        """
+        self._lock = threading.Lock()
+        self._min_rate = float(min_rate)
+        self._max_rate = float(max_rate) if max_rate is not None else None
+        self._rate = max(float(rate), self._min_rate)
+        if self._max_rate is not None:
+            self._rate = min(self._rate, self._max_rate)
+        self._capacity = float(capacity) if capacity is not None else max(1.0, self._rate)
+        self._tokens = self._capacity
+        self._increase = float(increase)
+        self._decrease = float(decrease)
+        self._last_refill = time.monotonic()
+
+    def _refill_locked(self):
+        """Adds tokens accrued since the last refill. Caller must hold the lock."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+
+    def acquire(self):
+        """Blocks until a token is available, then consumes it."""
+        while True:
+            with self._lock:
+                self._refill_locked()
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                # Time until one full token accrues at the current rate.
+                wait = (1.0 - self._tokens) / self._rate
+            # Sleep outside the lock so other threads can refill/adjust.
+            time.sleep(wait)
+
+    def on_success(self):
+        """Nudges the rate up after a successful request (additive increase)."""
+        with self._lock:
+            self._rate += self._increase
+            if self._max_rate is not None:
+                self._rate = min(self._rate, self._max_rate)
+
+    def on_failure(self):
+        """Cuts the rate after a rate-limit response (multiplicative decrease)."""
+        with self._lock:
+            old_rate = self._rate
+            self._rate = max(self._min_rate, self._rate * self._decrease)
+            # Drain any burst allowance so we don't immediately re-offend.
+            self._tokens = min(self._tokens, 1.0)
+        logger.debug(f"Rate limit feedback: request rate reduced from {old_rate:.2f}/s to {self._rate:.2f}/s.")
+
+    @property
+    def rate(self) -> float:
+        """Current refill rate in tokens per second."""
+        with self._lock:
+            return self._rate
+
+
+class CircuitBreaker:
+    """
+    Trips after a run of consecutive rate-limit failures and rejects calls
+    outright for a cool-down period.
+
+    Without this, a sustained rate-limit condition still costs MAX_RETRIES
+    attempts per token — retrying amplifies exactly the load that caused the
+    throttle. Once failure_threshold consecutive failures are seen, allow()
+    returns False until open_seconds have elapsed; the first success after
+    re-opening resets the count.
+
+    Thread-safe; intended to be shared process-wide across all tokens.
+    """
+
+    def __init__(self, failure_threshold: int = 10, open_seconds: float = 60.0):
+        self._lock = threading.Lock()
+        self._failure_threshold = int(failure_threshold)
+        self._open_seconds = float(open_seconds)
+        self._consecutive_failures = 0
+        self._open_until = 0.0
+
+    def allow(self) -> bool:
+        """Returns False while the breaker is open (calls should be skipped)."""
+        with self._lock:
+            return time.monotonic() >= self._open_until
+
+    def record_success(self):
+        """Resets the failure run after any successful response."""
+        with self._lock:
+            self._consecutive_failures = 0
+
+    def record_failure(self):
+        """Counts a rate-limit failure; trips the breaker at the threshold."""
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= self._failure_threshold:
+                self._open_until = time.monotonic() + self._open_seconds
+                self._consecutive_failures = 0
+                logger.warning(f"Circuit breaker tripped after {self._failure_threshold} consecutive rate-limit failures. Rejecting API calls for {self._open_seconds:.0f}s.")
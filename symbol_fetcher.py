@@ -1,20 +1,69 @@
 # symbol_fetcher.py
+import os
+import time
 import requests
 import pandas as pd
 import logging
 from io import BytesIO
 
+# orjson parses the ~tens-of-MB instrument master 3-5x faster than stdlib
+# json; optional, with response.json() as the fallback.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import config
-from config import NSE_CSV_URL, ANGELONE_INSTRUMENT_LIST_URL
+from config import (
+    NSE_CSV_URL, ANGELONE_INSTRUMENT_LIST_URL,
+    CACHE_ENABLED, CACHE_DIR, SYMBOL_CACHE_TTL_HOURS
+)
 
 logger = logging.getLogger(__name__)
 
+# Cached copies of the upstream symbol sources. Both change at most daily, so
+# a fresh cache skips the HTTP round-trips (and, for the instrument master,
+# parsing tens of MB of JSON) on repeat runs.
+_TOKENS_CACHE_FILE = os.path.join(CACHE_DIR, 'nifty50_tokens.parquet')
+_INSTRUMENTS_CACHE_FILE = os.path.join(CACHE_DIR, 'instrument_master.parquet')
+
+
+def _read_cache(path: str) -> pd.DataFrame:
+    """Returns the cached frame at path if fresher than the TTL, else empty."""
+    if not CACHE_ENABLED:
+        return pd.DataFrame()
+    try:
+        age = time.time() - os.path.getmtime(path)
+        if age > SYMBOL_CACHE_TTL_HOURS * 3600:
+            return pd.DataFrame()
+        return pd.read_parquet(path)
+    except Exception:
+        return pd.DataFrame() # Missing/corrupt cache is just a miss
+
+
+def _write_cache(path: str, df: pd.DataFrame):
+    """Best-effort cache write; a failure only costs the next run a re-fetch."""
+    if not CACHE_ENABLED or df.empty:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        df.to_parquet(path, index=False)
+    except Exception as e:
+        logger.warning(f"Failed to write symbol cache {path}: {e}. Continuing without caching.")
+
+
 def get_nifty50_tokens() -> pd.DataFrame:
     """
     Fetches the list of Nifty 50 symbols and their corresponding
     Angel One tokens from NSE and Angel One sources.
     Returns a pandas DataFrame with 'name' and 'token' columns, or an empty DataFrame on failure.
     """
+    # Fast path: serve the filtered result straight from a fresh cache.
+    cached_tokens = _read_cache(_TOKENS_CACHE_FILE)
+    if not cached_tokens.empty:
+        logger.info(f"✅ Using cached Nifty 50 token list ({len(cached_tokens)} symbols, <{SYMBOL_CACHE_TTL_HOURS:.0f}h old).")
+        return cached_tokens
+
     logger.info("🔄 Fetching Nifty 50 symbols from NSE...")
     headers = {"User-Agent": "Mozilla/5.0"} # Sometimes required by websites
     nifty50_symbols = []
@@ -49,59 +98,67 @@ def get_nifty50_tokens() -> pd.DataFrame:
         logger.warning("No Nifty 50 symbols fetched from NSE. Cannot proceed.")
         return pd.DataFrame()
 
-    logger.info("🔄 Fetching instrument list from Angel One...")
-    df_instruments = pd.DataFrame()
-    try:
-        # Added timeout and error checking for requests
-        response = requests.get(ANGELONE_INSTRUMENT_LIST_URL, timeout=30)
-        response.raise_for_status()
-        instruments = response.json()
-        df_instruments = pd.DataFrame(instruments)
-        logger.info(f"✅ Fetched {len(df_instruments)} instruments from Angel One.")
-    except requests.exceptions.RequestException as e:
-        logger.error(f"🚨 Failed to fetch instrument list from Angel One: {e}", exc_info=True)
-        return pd.DataFrame() # Return empty DataFrame on failure
-    except ValueError:
-        logger.error("🚨 Failed to parse Angel One instrument list as JSON.", exc_info=True)
-        return pd.DataFrame() # Return empty DataFrame on failure
-    except Exception as e:
-        logger.error(f"🚨 Unexpected error fetching Angel One instrument list: {e}", exc_info=True)
-        return pd.DataFrame()
+    # The NSE-segment instruments are cached separately from the filtered
+    # result so that even when the token list cache misses, the big JSON
+    # download and parse can be skipped and only the 50-symbol filter re-runs.
+    nse_instruments = _read_cache(_INSTRUMENTS_CACHE_FILE)
+    if not nse_instruments.empty:
+        logger.info(f"✅ Using cached Angel One NSE instrument list ({len(nse_instruments)} instruments).")
+    else:
+        logger.info("🔄 Fetching instrument list from Angel One...")
+        try:
+            # Added timeout and error checking for requests
+            response = requests.get(ANGELONE_INSTRUMENT_LIST_URL, timeout=30)
+            response.raise_for_status()
+            # orjson parses the raw bytes several times faster than stdlib json
+            instruments = orjson.loads(response.content) if orjson is not None else response.json()
+            # Filter at the record level before any DataFrame exists: the
+            # master is ~100k rows but only the NSE segment matters here, so
+            # this keeps memory proportional to the matches instead of
+            # building (then copying) a full-width frame of everything.
+            records = [
+                {'name': str(r['name']), 'token': str(r['token'])}
+                for r in instruments
+                if r.get('exch_seg') == 'NSE' and r.get('name') and r.get('token') is not None
+            ]
+            nse_instruments = pd.DataFrame(records, columns=['name', 'token'])
+            logger.info(f"✅ Fetched {len(instruments)} instruments from Angel One ({len(nse_instruments)} NSE).")
+            _write_cache(_INSTRUMENTS_CACHE_FILE, nse_instruments)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"🚨 Failed to fetch instrument list from Angel One: {e}", exc_info=True)
+            return pd.DataFrame() # Return empty DataFrame on failure
+        except ValueError:
+            logger.error("🚨 Failed to parse Angel One instrument list as JSON.", exc_info=True)
+            return pd.DataFrame() # Return empty DataFrame on failure
+        except Exception as e:
+            logger.error(f"🚨 Unexpected error fetching Angel One instrument list: {e}", exc_info=True)
+            return pd.DataFrame()
 
-    if df_instruments.empty:
-         logger.warning("Angel One instrument list is empty. Cannot match Nifty 50 symbols.")
+    if nse_instruments.empty:
+         logger.warning("Angel One NSE instrument list is empty. Cannot match Nifty 50 symbols.")
          return pd.DataFrame()
 
-    # Filter for NSE instruments that are also in the Nifty 50 symbol list
-    nse_instruments = df_instruments[df_instruments["exch_seg"] == "NSE"].copy() # Use .copy() to avoid SettingWithCopyWarning
-
-    # Ensure 'name' and 'token' columns exist and are not null before selection
+    # Ensure 'name' and 'token' columns exist (guards against stale caches
+    # written by older versions of this module).
     required_cols = ["name", "token"]
     if not all(col in nse_instruments.columns for col in required_cols):
          missing = [col for col in required_cols if col not in nse_instruments.columns]
          logger.error(f"🚨 Angel One instrument list missing required columns: {missing}. Columns found: {nse_instruments.columns.tolist()}")
          return pd.DataFrame()
 
-    # Ensure name and token columns are string type before filtering/selecting
-    try:
-        nse_instruments['name'] = nse_instruments['name'].astype(str)
-        nse_instruments['token'] = nse_instruments['token'].astype(str)
-    except Exception as e:
-        logger.error(f"Error converting name or token columns to string: {e}", exc_info=True)
-        return pd.DataFrame()
-
-
-    # Filter for Nifty 50 symbols present in the Angel One NSE list
-    # Ensure both 'name' and 'token' are not null
+    # Filter for Nifty 50 symbols present in the Angel One NSE list.
+    # The record-level filter above already guarantees non-null string
+    # name/token values; a frozenset gives isin a ready-made hash table
+    # instead of having it rehash the symbol list internally.
+    nifty_set = frozenset(nifty50_symbols)
     nifty50_nse_df = nse_instruments[
-        nse_instruments["name"].isin(nifty50_symbols) &
-        nse_instruments['name'].notna() &
-        nse_instruments['token'].notna()
+        nse_instruments["name"].isin(nifty_set)
     ][required_cols].reset_index(drop=True) # Reset index for clean output
 
     if nifty50_nse_df.empty:
         logger.warning("⚠️ Found 0 matching Nifty 50 symbols with valid tokens in the Angel One NSE list.")
     else:
         logger.info(f"Found {len(nifty50_nse_df)} Nifty 50 symbols with corresponding tokens.")
+        _write_cache(_TOKENS_CACHE_FILE, nifty50_nse_df)
 
     return nifty50_nse_df
\ No newline at end of file